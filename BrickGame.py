@@ -1,483 +1,491 @@
-import tkinter as tk
+import os
+import pickle
 import random
-import pygame
-
-# Inisialisasi pygame untuk mixer audio
-pygame.mixer.init()
+import time
+import tkinter as tk
+from collections import deque, namedtuple
+
+from events import (BallLost, BrickDestroyed, BrickHit, EventBus,
+                    LevelCleared, unique_bricks)
+from loop import FixedTimestep
+from particles import ParticlePool
+from profiler import FrameProfiler
+from quality import QualityGovernor
+from render import BrickLayer, Playfield, Renderer
+from autopilot import Autopilot
+from replay import Recorder, Recording, ACTIONS, CHECK, SERVE
+from sound import SoundBank
+from world import World, LEFT, RIGHT, LAUNCH, READY, PLAYING, BALL_LOST, WON, LOST
+
+# Titik awal untuk mengukur waktu sampai frame pertama tampil
+STARTED = time.perf_counter()
+KEYS = {'Left': LEFT, 'Right': RIGHT}
+
+# Snapshot permainan: WorldSnapshot ditambah state RNG partikel (pickle)
+GameSnapshot = namedtuple('GameSnapshot', ['world', 'rng'])
 
 class GameObject(object):
-    def __init__(self, canvas, item):
-        self.canvas = canvas
-        self.item = item
-
-    def get_position(self):
-        return self.canvas.coords(self.item)
-
-    def move(self, x, y):
-        self.canvas.move(self.item, x, y)
-
-    def delete(self):
-        self.canvas.delete(self.item)
-
-class Ball(GameObject):
-    def __init__(self, canvas, x, y):
-        self.radius = 10
-        self.direction = [1, -1]
-        # increase the below value to increase the speed of ball
-        self.speed = 5
-        item = canvas.create_oval(x-self.radius, y-self.radius,
-                                  x+self.radius, y+self.radius,
-                                  fill='white')
-        super(Ball, self).__init__(canvas, item)
-
-    def update(self):
-        coords = self.get_position()
-        width = self.canvas.winfo_width()
-        if coords[0] <= 0 or coords[2] >= width:
-            self.direction[0] *= -1
-        if coords[1] <= 0:
-            self.direction[1] *= -1
-        x = self.direction[0] * self.speed
-        y = self.direction[1] * self.speed
-        self.move(x, y)
-
-    def collide(self, game_objects):
-        coords = self.get_position()
-        x = (coords[0] + coords[2]) * 0.5
-        if len(game_objects) > 1:
-            self.direction[1] *= -1
-        elif len(game_objects) == 1:
-            game_object = game_objects[0]
-            coords = game_object.get_position()
-            if x > coords[2]:
-                self.direction[0] = 1
-            elif x < coords[0]:
-                self.direction[0] = -1
-            else:
-                self.direction[1] *= -1
-
-        for game_object in game_objects:
-            if isinstance(game_object, Brick):
-                game_object.hit()
-
-class Paddle(GameObject):
-    def __init__(self, canvas, x, y):
-        # set the shape and position of paddle
-        self.width = 80
-        self.height = 10
-        self.ball = None
-        item = canvas.create_rectangle(x - self.width / 2,
-                                       y - self.height / 2,
-                                       x + self.width / 2,
-                                       y + self.height / 2,
-                                       fill='#FFB643')
-        super(Paddle, self).__init__(canvas, item)
-
-    def set_ball(self, ball):
-        self.ball = ball
-
-    def move(self, offset):
-        coords = self.get_position()
-        width = self.canvas.winfo_width()
-        if coords[0] + offset >= 0 and coords[2] + offset <= width:
-            super(Paddle, self).move(offset, 0)
-            if self.ball is not None:
-                self.ball.move(offset, 0)
-
-class Brick(GameObject):
-    COLORS = {1: '#4535AA', 2: '#ED639E', 3: '#8FE1A2'}
-
-    def __init__(self, canvas, x, y, hits):
-        self.width = 75
-        self.height = 20
-        self.hits = hits
-        self.color = Brick.COLORS[hits]
-        item = canvas.create_rectangle(x - self.width / 2,
-                                       y - self.height / 2,
-                                       x + self.width / 2,
-                                       y + self.height / 2,
-                                       fill=self.color, tags='brick')
-        super(Brick, self).__init__(canvas, item)
-
-    def hit(self):
-        self.hits -= 1
-        if self.hits == 0:
-            self.create_particles()
-            self.delete()
-        else:
-            self.color = Brick.COLORS[self.hits]
-            self.canvas.itemconfig(self.item, fill=self.color)
-    
-    def create_particles(self):
-        # Mendapatkan posisi brick
-        coords = self.get_position()
-        x = (coords[0] + coords[2]) / 2
-        y = (coords[1] + coords[3]) / 2
-        for _ in range(20):  # 20 partikel untuk setiap brick
-            particle = Particle(self.canvas, x, y, self.color)
-            # Tambahkan partikel ke daftar global
-            self.canvas.master.particles.append(particle)
-
-
-class Game(tk.Frame):
-    def __init__(self, master):
-        super(Game, self).__init__(master)
-        self.lives = 3
-        self.width = 610
-        self.height = 400
-        self.canvas = tk.Canvas(self, bg='#D6D1F5',
-                                width=self.width,
-                                height=self.height,)
-        self.canvas.pack()
-        self.pack()
-
-        self.items = {}
-        self.ball = None
-        self.paddle = Paddle(self.canvas, self.width/2, 326)
-        self.items[self.paddle.item] = self.paddle
-        # adding brick with different hit capacities - 3,2 and 1
-        for x in range(5, self.width - 5, 75):
-            self.add_brick(x + 37.5, 50, 3)
-            self.add_brick(x + 37.5, 70, 2)
-            self.add_brick(x + 37.5, 90, 1)
-
-        self.hud = None
-        self.setup_game()
-        self.canvas.focus_set()
-        self.canvas.bind('<Left>',
-                         lambda _: self.paddle.move(-10))
-        self.canvas.bind('<Right>',
-                         lambda _: self.paddle.move(10))
-        self.particles = []
-
-
-    def setup_game(self):
-           self.add_ball()
-           self.update_lives_text()
-           self.text = self.draw_text(300, 200,
-                                      'Press Space to start')
-           self.canvas.bind('<space>', lambda _: self.start_game())
-
-    def add_ball(self):
-        if self.ball is not None:
-            self.ball.delete()
-        paddle_coords = self.paddle.get_position()
-        x = (paddle_coords[0] + paddle_coords[2]) * 0.5
-        self.ball = Ball(self.canvas, x, 310)
-        self.paddle.set_ball(self.ball)
-
-    def add_brick(self, x, y, hits):
-        brick = Brick(self.canvas, x, y, hits)
-        self.items[brick.item] = brick
-
-    def draw_text(self, x, y, text, size='40'):
-        font = ('Forte', size)
-        return self.canvas.create_text(x, y, text=text,
-                                       font=font)
+    # Objek kanvas hanya menampilkan state dari World; perubahan dikirim
+    # lewat Renderer milik Game dan baru diteruskan ke Tk saat flush
+    __slots__ = ('canvas', 'renderer', 'item', 'state')
 
-    def update_lives_text(self):
-        text = 'Lives: %s' % self.lives
-        if self.hud is None:
-            self.hud = self.draw_text(50, 20, text, 15)
-        else:
-            self.canvas.itemconfig(self.hud, text=text)
-
-    def start_game(self):
-        self.canvas.unbind('<space>')
-        self.canvas.delete(self.text)
-        self.paddle.ball = None
-        self.game_loop()
-
-    def game_loop(self):
-        self.check_collisions()
-        num_bricks = len(self.canvas.find_withtag('brick'))
-        if num_bricks == 0:
-            self.ball.speed = None
-            self.draw_text(300, 200, 'You win! You the Breaker of Bricks.')
-        elif self.ball.get_position()[3] >= self.height:
-            self.ball.speed = None
-            self.lives -= 1
-            if self.lives < 0:
-                self.draw_text(300, 200, 'You Lose! Game Over!')
-            else:
-                self.after(1000, self.setup_game)
-        else:
-            self.ball.update()
-            self.update_particles()
-            self.after(50, self.game_loop)
-
-    def check_collisions(self):
-        ball_coords = self.ball.get_position()
-        items = self.canvas.find_overlapping(*ball_coords)
-        objects = [self.items[x] for x in items if x in self.items]
-        self.ball.collide(objects)
-    
-    def update_particles(self):
-        # Update and remove expired particles
-        self.particles = [p for p in self.particles if p.update()]
-
-class GameObject(object):
-    def __init__(self, canvas, item):
+    def __init__(self, canvas, item, state):
         self.canvas = canvas
+        self.renderer = canvas.master.renderer
         self.item = item
+        self.state = state
 
     def get_position(self):
-        return self.canvas.coords(self.item)
+        return self.state.get_position()
 
-    def move(self, x, y):
-        self.canvas.move(self.item, x, y)
+    def render(self):
+        self.renderer.set_coords(self.item, *self.state.get_position())
 
     def delete(self):
-        self.canvas.delete(self.item)
+        self.renderer.delete(self.item)
 
 
 class Ball(GameObject):
-    def __init__(self, canvas, x, y):
-        self.radius = 10
-        self.direction = [1, -1]
-        self.speed = 5
-        self.tail_particles = []  # Menyimpan partikel ekor
-        item = canvas.create_oval(x-self.radius, y-self.radius,
-                                  x+self.radius, y+self.radius,
-                                  fill='white')
-        super(Ball, self).__init__(canvas, item)
+    __slots__ = ('radius', 'prev_x', 'prev_y', 'last_x', 'last_y')
+
+    def __init__(self, canvas, state):
+        self.radius = state.radius
+        item = canvas.master.renderer.create('oval', state.get_position(),
+                                             fill='white')
+        super(Ball, self).__init__(canvas, item, state)
+        self.sync()
 
     def update(self):
-        coords = self.get_position()
-        width = self.canvas.winfo_width()
-        
-        # Membalik arah jika bola menyentuh dinding
-        if coords[0] <= 0 or coords[2] >= width:
-            self.direction[0] *= -1
-        if coords[1] <= 0:
-            self.direction[1] *= -1
-        
-        # Menggerakkan bola
-        x = self.direction[0] * self.speed
-        y = self.direction[1] * self.speed
-        self.move(x, y)
+        # Dipanggil sekali per tick fisika; posisi sudah dihitung oleh World
+        x = self.state.x - self.last_x
+        y = self.state.y - self.last_y
 
         # Membuat efek ekor
-        self.create_tail_particles(coords[0] + self.radius, coords[1] + self.radius, x, y)
-
-    def collide(self, game_objects):
-        coords = self.get_position()
-        x = (coords[0] + coords[2]) * 0.5
-        if len(game_objects) > 1:
-            self.direction[1] *= -1
-        elif len(game_objects) == 1:
-            game_object = game_objects[0]
-            coords = game_object.get_position()
-            if x > coords[2]:
-                self.direction[0] = 1
-            elif x < coords[0]:
-                self.direction[0] = -1
-            else:
-                self.direction[1] *= -1
-
-        for game_object in game_objects:
-            if isinstance(game_object, Brick):
-                game_object.hit()  # Menghancurkan brick dan memutar suara
+        self.create_tail_particles(self.last_x, self.last_y, x, y)
+        self.prev_x = self.last_x
+        self.prev_y = self.last_y
+        self.last_x = self.state.x
+        self.last_y = self.state.y
+
+    def draw(self, alpha=1.0):
+        # Dipanggil setiap frame; posisi diinterpolasi antara dua tick terakhir
+        x = self.prev_x + (self.last_x - self.prev_x) * alpha
+        y = self.prev_y + (self.last_y - self.prev_y) * alpha
+        self.renderer.set_coords(self.item, x - self.radius, y - self.radius,
+                                 x + self.radius, y + self.radius)
+
+    def sync(self):
+        # Dipakai saat bola ikut paddle sebelum diluncurkan
+        self.render()
+        self.prev_x = self.last_x = self.state.x
+        self.prev_y = self.last_y = self.state.y
     
     def create_tail_particles(self, ball_x, ball_y, speed_x, speed_y):
-        # Membuat partikel ekor yang bergerak mengikuti bola
-        for _ in range(2):  # Membuat 2 partikel ekor per frame
-            particle = TailParticle(self.canvas, ball_x, ball_y, speed_x, speed_y)
-            self.canvas.master.particles.append(particle)  # Menambahkan ke daftar global partikel
-
-class TailParticle:
-    def __init__(self, canvas, x, y, speed_x, speed_y):
-        self.canvas = canvas
-        self.x = x
-        self.y = y
-        self.size = 5  # Ukuran awal partikel ekor
-        self.lifetime = 10  # Lama hidup partikel ekor
-        self.speed_x = speed_x * 0.5  # Kecepatan ekor sedikit lebih lambat dari bola
-        self.speed_y = speed_y * 0.5  # Kecepatan ekor sedikit lebih lambat dari bola
-        self.item = canvas.create_oval(x - self.size, y - self.size,
-                                       x + self.size, y + self.size,
-                                       fill='white', outline="")
-    
-    def update(self):
-        # Kurangi lifetime partikel
-        self.lifetime -= 1
-        if self.lifetime <= 0:
-            self.canvas.delete(self.item)
-            return False
-        
-        # Gerakkan partikel ekor mengikuti bola
-        self.canvas.move(self.item, self.speed_x, self.speed_y)
-        
-        # Kurangi ukuran partikel ekor agar semakin meredup
-        self.size -= 0.5
-        coords = self.canvas.coords(self.item)
-        new_coords = [coords[0] + 0.25, coords[1] + 0.25,
-                      coords[2] - 0.25, coords[3] - 0.25]
-        self.canvas.coords(self.item, *new_coords)
-        
-        return True
+        # Membuat partikel ekor yang bergerak mengikuti bola, disimpan di pool
+        # partikel global; jumlah dan umurnya mengikuti level kualitas
+        game = self.canvas.master
+        quality = game.quality
+        if quality.trail:
+            game.particles.trail(ball_x, ball_y, speed_x, speed_y,
+                                 count=quality.trail, life=quality.life(10))
 
 
 class Paddle(GameObject):
-    def __init__(self, canvas, x, y):
-        self.width = 80
-        self.height = 10
+    __slots__ = ('world', 'ball')
+
+    def __init__(self, canvas, world):
+        self.world = world
         self.ball = None
-        item = canvas.create_rectangle(x - self.width / 2,
-                                       y - self.height / 2,
-                                       x + self.width / 2,
-                                       y + self.height / 2,
-                                       fill='#FFB643')
-        super(Paddle, self).__init__(canvas, item)
+        item = canvas.master.renderer.create('rectangle',
+                                             world.paddle.get_position(),
+                                             fill='#FFB643')
+        super(Paddle, self).__init__(canvas, item, world.paddle)
 
     def set_ball(self, ball):
         self.ball = ball
 
     def move(self, offset):
-        coords = self.get_position()
-        width = self.canvas.winfo_width()
-        if coords[0] + offset >= 0 and coords[2] + offset <= width:
-            super(Paddle, self).move(offset, 0)
+        if self.world.move_paddle(offset):
+            self.render()
             if self.ball is not None:
-                self.ball.move(offset, 0)
+                self.ball.sync()
 
 
 class Brick(GameObject):
     COLORS = {1: '#4535AA', 2: '#ED639E', 3: '#8FE1A2'}
-
-    def __init__(self, canvas, x, y, hits):
-        self.width = 75
-        self.height = 20
-        self.hits = hits
-        self.color = Brick.COLORS[hits]
-        item = canvas.create_rectangle(x - self.width / 2,
-                                       y - self.height / 2,
-                                       x + self.width / 2,
-                                       y + self.height / 2,
-                                       fill=self.color, tags='brick')
-        super(Brick, self).__init__(canvas, item)
+    # Warna dan lapisan brick tidak disimpan per objek: warna dihitung dari
+    # state, lapisan sama untuk semua brick dalam satu Game
+    __slots__ = ()
+
+    def __init__(self, canvas, state):
+        item = None
+        # Dengan lapisan brick tidak ada item kanvas per brick
+        if canvas.master.brick_layer is None:
+            item = canvas.master.renderer.create('rectangle',
+                                                 state.get_position(),
+                                                 fill=Brick.fill(state),
+                                                 tags='brick')
+        super(Brick, self).__init__(canvas, item, state)
+
+    @property
+    def color(self):
+        return Brick.fill(self.state)
+
+    @staticmethod
+    def fill(state):
+        # View brick yang sudah hancur bisa dibuat belakangan (hanya untuk
+        # partikel), warnanya warna hit terakhir; brick lebih dari 3 hit
+        # (dibuat langsung lewat World.add_brick) memakai warna hit 3
+        return state.color or Brick.COLORS[min(max(state.hits, 1), 3)]
 
     def hit(self):
-        self.hits -= 1
-        if self.hits == 0:
-            self.create_particles()
+        # Jumlah hit sudah dikurangi oleh World, tinggal perbarui tampilan;
+        # suara dan partikel diurus subscriber lain di Game
+        layer = self.canvas.master.brick_layer
+        if layer is not None:
+            # Hanya kotak brick ini yang digambar ulang saat flush
+            layer.invalidate(self.state)
+        elif not self.state.alive:
             self.delete()
-        else:
-            self.color = Brick.COLORS[self.hits]
-            self.canvas.itemconfig(self.item, fill=self.color)
-
-        # Memutar suara saat brick kena
-        self.play_hit_sound()
-    
-    def play_hit_sound(self):
-        # Memutar suara saat brick terkena bola
-        hit_sound = pygame.mixer.Sound('hit_sound.mp3')  # Ganti dengan file suara Anda
-        hit_sound.set_volume(1.5)  # Menetapkan volume suara (opsional)
-        hit_sound.play()
-    
-    def create_particles(self):
-        # Mendapatkan posisi brick
-        coords = self.get_position()
-        x = (coords[0] + coords[2]) / 2
-        y = (coords[1] + coords[3]) / 2
-        for _ in range(20):  # 20 partikel untuk setiap brick
-            particle = Particle(self.canvas, x, y, self.color)
-            self.canvas.master.particles.append(particle)  # Tambahkan ke daftar partikel
-
-class Particle:
-    def __init__(self, canvas, x, y, color):
-        self.canvas = canvas
-        self.x = x
-        self.y = y
-        self.size = 10  # Ukuran awal partikel lebih besar
-        self.lifetime = 20  # Jumlah update sebelum partikel menghilang
-        self.speed_x = (random.random() - 0.5) * 6  # Kecepatan horizontal
-        self.speed_y = (random.random() - 0.5) * 6  # Kecepatan vertikal
-        self.color = color  # Simpan warna asli
-        self.item = canvas.create_oval(x - self.size, y - self.size,
-                                       x + self.size, y + self.size,
-                                       fill=self.color, outline="")
-
-    def update(self):
-        # Kurangi lifetime
-        self.lifetime -= 0.5
-        if self.lifetime <= 0:
-            self.canvas.delete(self.item)
-            return False
-
-        # Hitung faktor redup berdasarkan sisa lifetime
-        factor = self.lifetime / 20  # Faktor redup berdasarkan lifetime maksimum
-
-
-        # Kurangi ukuran partikel
-        self.size -= 150
-        coords = self.canvas.coords(self.item)
-        new_coords = [coords[0] + 0.25, coords[1] + 0.25,
-                      coords[2] - 0.25, coords[3] - 0.25]
-        self.canvas.coords(self.item, *new_coords)
-
-        # Gerakkan partikel
-        self.canvas.move(self.item, self.speed_x, self.speed_y)
-        return True
-        
+        elif self.state.color is None:
+            self.renderer.configure(self.item, fill=self.color)
 
 class Game(tk.Frame):
-    def __init__(self, master):
+    def __init__(self, master, fps=60, swept=False, extra_balls=0,
+                 multiball_every=0, profile=None, overlay=False, seed=None,
+                 level=None, audio=True, record=None, replay=None,
+                 autopilot=False, brick_layer=False, quality=None,
+                 broadcast=None):
         super(Game, self).__init__(master)
         self.lives = 3
+        # Ukuran lapangan dalam koordinat World; di layar lapangan diskalakan
+        # mengikuti ukuran jendela (lihat Playfield dan on_configure)
         self.width = 610
         self.height = 400
-        self.canvas = tk.Canvas(self, bg='#D6D1F5',
+        self.canvas = tk.Canvas(self, bg='#2B2540',
                                 width=self.width,
-                                height=self.height)
-        self.canvas.pack()
-        self.pack()
-
-        self.items = {}
+                                height=self.height,
+                                highlightthickness=0)
+        self.canvas.pack(fill='both', expand=True)
+        self.pack(fill='both', expand=True)
+        self.playfield = Playfield(self.width, self.height)
+        self.renderer = Renderer(self.canvas, self.playfield)
+        self.field = self.renderer.create('rectangle',
+                                          (0, 0, self.width, self.height),
+                                          fill='#D6D1F5', width=0)
+        self.texts = {}
+        # Fisika tetap 20 tick per detik seperti semula, render mengikuti fps
+        self.timestep = FixedTimestep(tick=0.05, fps=fps)
+        # Efek kosmetik diturunkan otomatis bila frame melewati anggaran;
+        # quality berisi angka untuk mengunci level tertentu
+        self.quality = QualityGovernor(self.timestep.frame_time, level=quality,
+                                       adaptive=quality is None)
+        self.frame_started = None
+        self.frame_delay = 0.0
+        # Profiler hanya dibuat bila diminta; profile adalah path ekspor
+        # (.csv atau .json) yang ditulis saat jendela ditutup
+        self.profile = profile
+        self.profiler = FrameProfiler() if profile or overlay else None
+        self.overlay = None
+        if overlay:
+            self.overlay = self.draw_text(self.width - 10, 10, '', 9,
+                                          family='Courier', anchor='ne')
+
+        # Mixer dibuka dan semua suara didekode di thread latar; lagu menang
+        # dan kalah ikut didekode di depan supaya siap saat dibutuhkan
+        self.sounds = SoundBank()
+        if audio:
+            self.sounds.start(
+                effects=[('hit', 'hit_sound.mp3', 1.5)],  # Ganti dengan file suara Anda
+                tracks=[('win', 'win_soundtrack.wav', 1),
+                        ('game_over', 'game_over.mp3', 1)],
+                music='soundtrack.mp3')
+
+        # Semua state permainan ada di World, Game hanya menggambarnya
+        # extra_balls: mode stres, bola tambahan yang ikut diluncurkan
+        # level: fungsi yang mengisi brick ke World (default: 3 baris bawaan)
+        self.replay = None
+        if replay is not None:
+            # Konfigurasi World dan seed diambil dari rekaman
+            self.replay = Recording.load(replay)
+            self.replay_events = deque(self.replay.events)
+            self.divergences = []
+            self.world = self.replay.world(level)
+            self.lives = self.world.lives
+            seed = self.replay.seed
+        else:
+            self.world = World(self.width, self.height, self.lives,
+                               swept=swept, multiball_every=multiball_every,
+                               launch_balls=extra_balls)
+            if level is None:
+                self.world.add_default_bricks()
+            else:
+                level(self.world)
+        self.extra_items = {}
+        # Rekaman menyimpan seed partikel, jadi seed harus selalu diketahui
+        self.record = record
+        self.recorder = None
+        if record is not None:
+            if seed is None:
+                seed = random.randrange(2 ** 32)
+            self.recorder = Recorder(self.world, seed)
+        # Efek samping fisika (brick kena, bola jatuh, level selesai)
+        # dikumpulkan per frame lalu dibagikan sekaligus ke subscriber
+        self.events = EventBus()
+        self.world.bus = self.events
+        self.events.subscribe([BrickHit, BrickDestroyed], self.on_bricks)
+        self.events.subscribe([BrickHit, BrickDestroyed], self.on_hit_sound)
+        self.events.subscribe([BrickDestroyed], self.on_brick_particles)
+        self.events.subscribe([BallLost], self.on_ball_lost)
+        self.events.subscribe([LevelCleared], self.on_level_cleared)
+        # Paddle digerakkan komputer ke titik jatuh bola (lihat autopilot.py)
+        self.autopilot = Autopilot(self.world) if autopilot else None
+        # broadcast: (host, port) untuk menyiarkan state ke penonton di LAN
+        # (lihat spectate.py); pengiriman berjalan di thread sendiri
+        self.broadcaster = None
+        if broadcast is not None:
+            from spectate import Broadcaster
+            try:
+                self.broadcaster = Broadcaster(self.world, *broadcast).start()
+            except OSError as error:
+                # Port dipakai atau alamat salah: main tanpa siaran
+                print('broadcast: gagal membuka %s:%s (%s)' % (
+                    broadcast[0], broadcast[1], error))
+        self.bricks = {}
+        # brick_layer: semua brick digambar ke satu gambar latar (lihat
+        # BrickLayer); view Brick baru dibuat saat brick pertama kali kena
+        self.brick_layer = None
+        if brick_layer:
+            self.brick_layer = BrickLayer(self.renderer, self.world,
+                                          '#D6D1F5', Brick.fill)
         self.ball = None
-        self.paddle = Paddle(self.canvas, self.width/2, 326)
-        self.items[self.paddle.item] = self.paddle
-        self.particles = []  # Tambahkan daftar partikel global
-        # Menambahkan bricks
-        for x in range(5, self.width - 5, 75):
-            self.add_brick(x + 37.5, 50, 3)
-            self.add_brick(x + 37.5, 70, 2)
-            self.add_brick(x + 37.5, 90, 1)
+        self.paddle = Paddle(self.canvas, self.world)
+        self.particles = ParticlePool(seed=seed)  # Pool partikel global
+        self.particle_items = [None] * self.particles.capacity
+        # Item kanvas hanya dibuat untuk brick di area yang terlihat; brick
+        # lain dibuatkan saat pertama kali dibutuhkan (lihat brick_view)
+        if self.brick_layer is None:
+            for state in self.world.grid.query([0, 0, self.width, self.height]):
+                self.add_brick(state)
+
+        # Tombol yang sedang ditekan; paddle digerakkan sekali per tick selama
+        # tombol ditahan, jadi kecepatannya tidak bergantung key-repeat OS
+        self.held = set()
+        self.pressed = set()
+        # Waktu event KeyRelease terakhir per aksi (lihat key_press)
+        self.released = {}
+        self.polling = None
+        # Latensi dari event tombol sampai posisi paddle dikirim ke Tk;
+        # latency_hook(detik) dipanggil untuk setiap pengukuran (debug)
+        self.key_time = None
+        self.move_time = None
+        self.input_latency = deque(maxlen=120)
+        self.latency_hook = None
 
         self.hud = None
+        self.text = None
+        self.banner = None
+        self.loop_id = None
+        self.pending_setup = None
         self.setup_game()
         self.canvas.focus_set()
-        self.canvas.bind('<Left>',
-                         lambda _: self.paddle.move(-10))
-        self.canvas.bind('<Right>',
-                         lambda _: self.paddle.move(10))
+        # Satu-satunya tempat ukuran kanvas dibaca
+        self.canvas.bind('<Configure>', self.on_configure)
+        if self.replay is None:
+            self.canvas.bind('<KeyPress>', self.key_press)
+            self.canvas.bind('<KeyRelease>', self.key_release)
+            self.canvas.bind('<FocusOut>', lambda _: self.held.clear())
+        else:
+            self.after(50, self.replay_idle)
 
         self.music_playing = False  # Flag untuk cek apakah musik sudah diputar
+        self.startup_time = None
+        self.after_idle(self.first_frame)
+        # Titik awal level untuk restart() tanpa membangun ulang semua brick
+        self.start = self.snapshot()
+
+    def first_frame(self):
+        self.startup_time = time.perf_counter() - STARTED
+        if self.profiler is not None:
+            print('time to first frame: %.1f ms' % (self.startup_time * 1000))
 
     def setup_game(self):
+        self.pending_setup = None
         self.add_ball()
         self.update_lives_text()
-        self.text = self.draw_text(300, 200,
-                                    'Press Space to start')
-        self.canvas.bind('<space>', lambda _: self.start_game())
-        
+        self.wait_for_launch()
+        self.publish()
+
+    def wait_for_launch(self):
+        if self.text is None:
+            self.text = self.draw_text(self.width // 2, self.height // 2,
+                                       'Press Space to start')
+        if self.replay is None:
+            self.canvas.bind('<space>', lambda _: self.input(LAUNCH))
+        if self.autopilot is not None:
+            self.after(1000, lambda: self.input(LAUNCH))
+
+    def input(self, action):
+        # Semua input pemain lewat sini supaya bisa direkam
+        if self.recorder is not None:
+            self.recorder.record(self.world.tick, action)
+        self.apply_input(action)
+
+    def key_press(self, event):
+        action = KEYS.get(event.keysym)
+        if action is None:
+            return
+        released = self.released.pop(action, None)
+        if released is not None and released == getattr(event, 'time', None):
+            # Auto-repeat di X11 dikirim sebagai KeyRelease+KeyPress dengan
+            # waktu yang sama: tombol sebenarnya masih ditahan
+            self.held.add(action)
+        elif action not in self.held:
+            # Key-repeat OS tidak menambah apa-apa selama tombol masih ditahan
+            self.held.add(action)
+            self.pressed.add(action)
+            if self.key_time is None:
+                self.key_time = time.perf_counter()
+        if self.world.state == READY and self.polling is None:
+            self.poll_input()
+
+    def key_release(self, event):
+        action = KEYS.get(event.keysym)
+        self.held.discard(action)
+        self.released[action] = getattr(event, 'time', None)
+
+    def sample_input(self):
+        # Dipanggil sekali per tick; tombol yang ditekan lalu dilepas di
+        # antara dua tick tetap dihitung satu langkah
+        actions = self.held | self.pressed
+        self.pressed = set()
+        if (LEFT in actions) == (RIGHT in actions):
+            return
+        self.input(LEFT if LEFT in actions else RIGHT)
+        if self.key_time is not None:
+            # Latensi baru dihitung saat posisi paddle dikirim ke Tk
+            self.move_time = self.key_time
+            self.key_time = None
+
+    def measure_latency(self):
+        if self.move_time is None:
+            return
+        latency = time.perf_counter() - self.move_time
+        self.move_time = None
+        self.input_latency.append(latency)
+        if self.latency_hook is not None:
+            self.latency_hook(latency)
+
+    def poll_input(self):
+        # Sebelum bola diluncurkan game loop belum jalan, jadi tombol yang
+        # ditahan diproses di sini dengan laju tick yang sama
+        self.polling = None
+        if self.world.state != READY:
+            return
+        self.sample_input()
+        self.renderer.flush()
+        self.measure_latency()
+        self.publish()
+        if self.held:
+            self.polling = self.after(int(self.timestep.tick * 1000),
+                                      self.poll_input)
+
+    def apply_input(self, action):
+        if action == LEFT:
+            self.paddle.move(-self.world.PADDLE_STEP)
+        elif action == RIGHT:
+            self.paddle.move(self.world.PADDLE_STEP)
+        elif action == LAUNCH:
+            self.start_game()
+
+    def replay_step(self):
+        # Terapkan event rekaman yang jatuh tempo pada tick sekarang
+        events = self.replay_events
+        while events and events[0][0] == self.world.tick:
+            tick, code, value = events[0]
+            if code == SERVE and self.world.state != READY:
+                return  # Tunggu setup_game menyiapkan bola baru
+            events.popleft()
+            if code == CHECK:
+                if self.world.checksum() != value:
+                    self.divergences.append(tick)
+            elif code != SERVE:
+                self.apply_input(ACTIONS[code])
+
+    def replay_idle(self):
+        # Di luar game loop (sebelum bola diluncurkan) event diproses di sini
+        if self.world.state != PLAYING:
+            self.replay_step()
+            self.renderer.flush()
+        if self.replay_events and self.world.state not in (WON, LOST):
+            self.after(50, self.replay_idle)
 
     def add_ball(self):
         if self.ball is not None:
             self.ball.delete()
-        paddle_coords = self.paddle.get_position()
-        x = (paddle_coords[0] + paddle_coords[2]) * 0.5
-        self.ball = Ball(self.canvas, x, 310)
+        if self.world.state != READY:
+            self.world.serve()
+            if self.recorder is not None:
+                self.recorder.serve(self.world.tick)
+        self.ball = Ball(self.canvas, self.world.ball)
         self.paddle.set_ball(self.ball)
-
-    def add_brick(self, x, y, hits):
-        brick = Brick(self.canvas, x, y, hits)
-        self.items[brick.item] = brick
-
-    def draw_text(self, x, y, text, size='40'):
-        font = ('Forte', size)
-        return self.canvas.create_text(x, y, text=text,
-                                       font=font)
+        self.renderer.flush()
+
+    def add_brick(self, state):
+        brick = Brick(self.canvas, state)
+        self.bricks[state.index] = brick
+        return brick
+
+    def brick_view(self, state):
+        brick = self.bricks.get(state.index)
+        if brick is None:
+            brick = self.add_brick(state)
+        return brick
+
+    def draw_text(self, x, y, text, size='40', family='Forte', **options):
+        # Posisi dan ukuran font dicatat supaya bisa diskalakan ulang
+        playfield = self.playfield
+        item = self.canvas.create_text(
+            *playfield.to_screen((x, y)), text=text,
+            font=(family, playfield.font_size(size)), **options)
+        self.texts[item] = (x, y, family, size)
+        return item
+
+    def on_configure(self, event):
+        if self.playfield.configure(event.width, event.height):
+            self.relayout()
+
+    def relayout(self):
+        # Skala berubah: semua item dipindah ke posisi layar yang baru.
+        # Koordinat World tidak berubah sama sekali.
+        renderer = self.renderer
+        playfield = self.playfield
+        renderer.reproject()
+        renderer.set_coords(self.field, 0, 0, self.width, self.height)
+        for brick in self.bricks.values():
+            if brick.item in renderer.kinds:
+                brick.render()
+        if self.brick_layer is not None:
+            self.brick_layer.layout()
+        self.paddle.render()
+        if self.ball is not None:
+            self.ball.draw(self.timestep.alpha())
+        extra = self.world.extra_balls
+        for slot, item in self.extra_items.items():
+            renderer.set_coords(item, *extra.bounds(slot))
+        for slot in self.particles.live_slots():
+            item = self.particle_items[slot]
+            if item is not None:
+                renderer.set_coords(item, *self.particles.bounds(slot))
+        for item, (x, y, family, size) in self.texts.items():
+            self.canvas.coords(item, *playfield.to_screen((x, y)))
+            self.canvas.itemconfig(
+                item, font=(family, playfield.font_size(size)))
+        renderer.flush()
+
+    def delete_text(self, item):
+        self.texts.pop(item, None)
+        self.canvas.delete(item)
 
     def update_lives_text(self):
         text = 'Lives: %s' % self.lives
@@ -487,9 +495,15 @@ class Game(tk.Frame):
             self.canvas.itemconfig(self.hud, text=text)
 
     def start_game(self):
+        if self.world.state != READY:
+            return
         self.canvas.unbind('<space>')
-        self.canvas.delete(self.text)
+        self.delete_text(self.text)
+        self.text = None
         self.paddle.ball = None
+        self.world.launch()
+        self.timestep.reset()
+        self.frame_started = None
         self.game_loop()
 
         # Mulai memutar soundtrack jika belum diputar
@@ -498,72 +512,322 @@ class Game(tk.Frame):
             self.music_playing = True
     
     def play_soundtrack(self):
-        # Muat dan putar musik (gunakan file audio yang ada di direktori game)
-        pygame.mixer.music.load('soundtrack.mp3')  # Ganti dengan path file musik Anda
-        pygame.mixer.music.set_volume(0.75)  # Menetapkan volume musik (opsional)
-        pygame.mixer.music.play(-1, 0.0)  # Pemutaran looping tak terbatas, mulai dari 0 detik
+        # Musik sudah dimuat di thread latar; bila belum siap, diputar nanti
+        self.sounds.play_music(0.75, -1)  # Pemutaran looping tak terbatas
 
     def play_win_soundtrack(self):
-        # Hentikan musik yang sedang diputar
-        pygame.mixer.music.stop()
-
-        # Putar musik kemenangan
-        pygame.mixer.music.load('win_soundtrack.wav')  # Ganti dengan path file musik kemenangan Anda
-        pygame.mixer.music.set_volume(1)  # Menetapkan volume musik (opsional)
-        pygame.mixer.music.play(0, 0.0)  # Musik hanya diputar sekali
+        # Hentikan musik latar dan putar musik kemenangan (sudah didekode)
+        self.sounds.play_track('win')
 
         # Tampilkan pesan kemenangan
-        self.canvas.create_text(self.width // 2, self.height // 2,
-                                text="YOU WIN!", font=('Arial', 30), fill='green')
+        self.banner = self.draw_text(self.width // 2, self.height // 2,
+                                     "YOU WIN!", 30, family='Arial',
+                                     fill='green')
 
     def game_over(self):
-        # Hentikan musik yang sedang diputar
-        pygame.mixer.music.stop()
-
-        # Putar musik Game Over
-        pygame.mixer.music.load('game_over.mp3')  # Ganti dengan path file musik game over
-        pygame.mixer.music.set_volume(1)  # Menetapkan volume musik (opsional)
-        pygame.mixer.music.play(0, 0.0)  # Musik hanya diputar sekali
+        # Hentikan musik latar dan putar musik Game Over (sudah didekode)
+        self.sounds.play_track('game_over')
 
         # Tampilkan pesan game over
-        self.canvas.create_text(self.width // 2, self.height // 2,
-                                text="GAME OVER", font=('Arial', 30), fill='red')
+        self.banner = self.draw_text(self.width // 2, self.height // 2,
+                                     "GAME OVER", 30, family='Arial',
+                                     fill='red')
 
     def game_loop(self):
-        self.check_collisions()
-        num_bricks = len(self.canvas.find_withtag('brick'))
-        if num_bricks == 0:
-            self.ball.speed = None
-            self.play_win_soundtrack()  # Panggil musik kemenangan jika semua brick dihancurkan
-        elif self.ball.get_position()[3] >= self.height:  # Bola jatuh
-            self.ball.speed = None
-            self.lives -= 1
-            if self.lives < 0:
-                self.game_over()  # Pemanggilan game over jika hidup habis
-            else:
-                self.after(1000, self.setup_game)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin()
+        self.loop_id = None
+        self.govern()
+        # Jalankan tick fisika sebanyak waktu yang sudah lewat, lalu gambar
+        ticks = 0
+        for _ in range(self.timestep.advance()):
+            self.tick()
+            ticks += 1
+            if self.world.state != PLAYING:
+                break
+        self.events.dispatch()
+        if profiler is not None:
+            profiler.mark('hits')
+        self.sounds.flush()
+        if profiler is not None:
+            profiler.mark('sound')
+        if self.world.state == PLAYING:
+            self.ball.draw(self.timestep.alpha())
+            self.draw_extra_balls()
+            delay = self.timestep.next_delay()
+            self.frame_delay = delay / 1000.0
+            self.loop_id = self.after(delay, self.game_loop)
+        if profiler is not None:
+            profiler.mark('draw')
+            if self.overlay is not None and profiler.count % 15 == 0:
+                self.update_overlay()
+        # Semua perubahan kanvas frame ini dikirim ke Tk sekaligus
+        if self.brick_layer is not None:
+            self.brick_layer.flush()
+        calls = self.renderer.flush()
+        self.measure_latency()
+        if profiler is not None:
+            profiler.mark('flush')
+            # Paksa Tk menggambar sekarang supaya waktu redraw bisa diukur
+            self.update_idletasks()
+            profiler.mark('redraw')
+            profiler.end(ticks, len(self.renderer.kinds),
+                         self.particles.live_count(), calls)
+
+    def govern(self):
+        # Waktu sibuk frame sebelumnya: semua yang bukan jeda after()
+        now = time.perf_counter()
+        if self.frame_started is not None:
+            level = self.quality.level
+            busy = now - self.frame_started - self.frame_delay
+            if self.quality.record(busy) < level:
+                self.particles.limit_life(self.quality.life(40))
+        self.frame_started = now
+
+    def snapshot(self):
+        return GameSnapshot(self.world.snapshot(),
+                            pickle.dumps(self.particles.rng.bit_generator.state))
+
+    def restore(self, snapshot):
+        # Kanvas disesuaikan dengan selisihnya saja: hanya brick yang berubah
+        # yang disentuh, bola dan paddle dipindah, item lain dipakai lagi
+        if self.recorder is not None or self.replay is not None:
+            raise RuntimeError('restore tidak bisa dipakai saat merekam '
+                               'atau memutar ulang')
+        for after_id in (self.pending_setup, self.loop_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self.pending_setup = self.loop_id = None
+        world = self.world
+        self.events.clear()
+        for state in world.restore(snapshot.world):
+            self.refresh_brick(state)
+        self.particles.rng.bit_generator.state = pickle.loads(snapshot.rng)
+        self.clear_particles()
+
+        self.lives = world.lives
+        self.update_lives_text()
+        self.paddle.render()
+        self.ball.state = world.ball
+        self.ball.sync()
+        self.draw_extra_balls()
+        if self.banner is not None:
+            self.delete_text(self.banner)
+            self.banner = None
+        if world.state == READY:
+            self.paddle.set_ball(self.ball)
+            self.wait_for_launch()
         else:
+            self.paddle.set_ball(None)
+            if self.text is not None:
+                self.canvas.unbind('<space>')
+                self.delete_text(self.text)
+                self.text = None
+            if world.state == PLAYING:
+                # Tick pertama baru jalan di frame berikutnya, jadi World
+                # tepat sama dengan snapshot setelah restore() kembali
+                self.timestep.reset()
+                self.frame_started = None
+                self.loop_id = self.after(
+                    int(self.timestep.frame_time * 1000), self.game_loop)
+            elif world.state == BALL_LOST:
+                self.pending_setup = self.after(1000, self.setup_game)
+            elif world.state == WON:
+                self.play_win_soundtrack()
+            elif world.state == LOST:
+                self.game_over()
+        if self.brick_layer is not None:
+            self.brick_layer.flush()
+        self.renderer.flush()
+        if self.broadcaster is not None:
+            # Tick mundur: penonton disinkronkan ulang lewat keyframe
+            self.broadcaster.want_key = True
+            self.publish()
+
+    def restart(self):
+        self.restore(self.start)
+
+    def refresh_brick(self, state):
+        if self.brick_layer is not None:
+            self.brick_layer.invalidate(state)
+            return
+        brick = self.bricks.get(state.index)
+        if brick is None:
+            return  # Di luar layar dan belum pernah punya item
+        shown = brick.item in self.renderer.kinds
+        if state.alive and not shown:
+            self.add_brick(state)
+        elif state.alive:
+            self.renderer.configure(brick.item, fill=brick.color)
+        elif shown:
+            brick.delete()
+
+    def clear_particles(self):
+        particles = self.particles
+        for slot in particles.live_slots():
+            if self.particle_items[slot] is not None:
+                self.renderer.release(self.particle_items[slot])
+                self.particle_items[slot] = None
+        particles.alive[:] = False
+
+    def update_overlay(self):
+        p50, p99 = self.profiler.percentiles()
+        text = 'p50 %.1f ms  p99 %.1f ms' % (p50 * 1000, p99 * 1000)
+        text += '\nquality %d' % self.quality.level
+        if self.input_latency:
+            text += '\ninput %.1f ms' % (self.input_latency[-1] * 1000)
+        self.renderer.configure(self.overlay, text=text)
+
+    def export_profile(self):
+        if self.profiler is not None and isinstance(self.profile, str):
+            self.profiler.export(self.profile)
+
+    def shutdown(self):
+        self.export_profile()
+        if self.recorder is not None:
+            self.recorder.save(self.record, self.world)
+        if self.broadcaster is not None:
+            try:
+                self.broadcaster.close()
+            except Exception as error:
+                # Siaran hanya tambahan; jendela tetap harus bisa ditutup
+                print('broadcast: gagal menutup (%s)' % error)
+
+    def publish(self):
+        if self.broadcaster is not None:
+            self.broadcaster.publish(self.world)
+
+    def tick(self):
+        profiler = self.profiler
+        if self.replay is not None:
+            self.replay_step()
+        if self.autopilot is not None:
+            for action in self.autopilot.actions():
+                self.input(action)
+        elif self.replay is None:
+            self.sample_input()
+        # Brick yang kena, bola jatuh dan level selesai masuk ke self.events
+        # dan baru ditangani sekali di akhir frame (lihat game_loop)
+        self.world.step()
+        if self.recorder is not None:
+            self.recorder.tick(self.world)
+        self.publish()
+        if profiler is not None:
+            profiler.mark('step')
+        if self.world.state == PLAYING:
+            if self.ball.state is not self.world.ball:
+                # Bola utama jatuh dan digantikan salah satu bola tambahan
+                self.ball.state = self.world.ball
+                self.ball.sync()
             self.ball.update()
+            if profiler is not None:
+                profiler.mark('ball')
             self.update_particles()  # Perbarui partikel
-            self.after(50, self.game_loop)
-
-    def check_collisions(self):
-        ball_coords = self.ball.get_position()
-        items = self.canvas.find_overlapping(*ball_coords)
-        objects = [self.items[x] for x in items if x in self.items]
-        self.ball.collide(objects)
+            if profiler is not None:
+                profiler.mark('particles')
     
+    def on_bricks(self, events):
+        layer = self.brick_layer
+        for state in unique_bricks(events):
+            if layer is not None:
+                # Kotak brick digambar ulang saat flush, termasuk brick yang
+                # hancur tanpa pernah punya view
+                layer.invalidate(state)
+            elif state.alive or state.index in self.bricks:
+                # Brick yang hancur sebelum pernah tampil tidak perlu view
+                self.brick_view(state).hit()
+
+    def on_hit_sound(self, events):
+        # Satu suara per frame berapa pun brick yang kena
+        self.sounds.play('hit')
+
+    def on_brick_particles(self, events):
+        # Pecahan brick, 20 partikel per brick pada kualitas penuh
+        quality = self.quality
+        for state in unique_bricks(events):
+            self.particles.burst(state.x, state.y, Brick.fill(state),
+                                 count=quality.burst, life=quality.life(40))
+
+    def on_ball_lost(self, events):
+        self.lives = self.world.lives
+        if self.world.state == LOST:
+            self.game_over()  # Pemanggilan game over jika hidup habis
+        else:
+            self.update_lives_text()
+            self.pending_setup = self.after(1000, self.setup_game)
+
+    def on_level_cleared(self, events):
+        # Panggil musik kemenangan jika semua brick dihancurkan
+        self.play_win_soundtrack()
+
+    def draw_extra_balls(self):
+        extra = self.world.extra_balls
+        renderer = self.renderer
+        for slot in list(self.extra_items):
+            if not extra.alive[slot]:
+                renderer.release(self.extra_items.pop(slot))
+        for slot in extra.live_slots():
+            item = self.extra_items.get(slot)
+            if item is None:
+                self.extra_items[slot] = renderer.acquire(
+                    'oval', extra.bounds(slot), fill='white', outline='black')
+            else:
+                renderer.set_coords(item, *extra.bounds(slot))
+
     def update_particles(self):
-        active_particles = []
-        for particle in self.particles:
-            if particle.update():  # Hanya simpan partikel yang masih aktif
-                active_particles.append(particle)
-        self.particles = active_particles
+        particles = self.particles
+        renderer = self.renderer
+        for slot in particles.update():
+            # Item oval disembunyikan dan disimpan untuk partikel berikutnya
+            renderer.release(self.particle_items[slot])
+            self.particle_items[slot] = None
+        for slot in particles.live_slots():
+            item = self.particle_items[slot]
+            if item is None:
+                color = particles.palette[particles.color[slot]]
+                self.particle_items[slot] = renderer.acquire(
+                    'oval', particles.bounds(slot), fill=color, outline="")
+            else:
+                renderer.set_coords(item, *particles.bounds(slot))
 
 
 
 if __name__ == '__main__':
     root = tk.Tk()
     root.title('Break those Bricks!')
-    game = Game(root)
-    game.mainloop()
\ No newline at end of file
+    if os.environ.get('BRICKGAME_FULLSCREEN'):
+        # Lapangan diskalakan ke ukuran layar (mis. kabinet arcade 4K)
+        root.attributes('-fullscreen', True)
+    quality = os.environ.get('BRICKGAME_QUALITY')
+    quality = int(quality) if quality else None
+    # BRICKGAME_PROFILE=frames.csv menyimpan telemetri frame saat keluar,
+    # BRICKGAME_OVERLAY=1 menampilkan p50/p99 waktu frame di pojok layar,
+    # BRICKGAME_RECORD=sesi.brr merekam input untuk diputar ulang (replay.py),
+    # BRICKGAME_AUTOPILOT=1 membiarkan komputer yang bermain,
+    # BRICKGAME_BRICK_LAYER=1 menggambar semua brick sebagai satu gambar,
+    # BRICKGAME_LATENCY=1 mencetak latensi tombol ke paddle,
+    # BRICKGAME_QUALITY=0..3 mengunci level efek (default: otomatis),
+    # BRICKGAME_BROADCAST=0.0.0.0:7777 menyiarkan permainan ke penonton
+    broadcast = os.environ.get('BRICKGAME_BROADCAST')
+    if broadcast:
+        from spectate import parse_address
+        broadcast = parse_address(broadcast, '0.0.0.0')
+    game = Game(root, profile=os.environ.get('BRICKGAME_PROFILE'),
+                overlay=bool(os.environ.get('BRICKGAME_OVERLAY')),
+                record=os.environ.get('BRICKGAME_RECORD'),
+                autopilot=bool(os.environ.get('BRICKGAME_AUTOPILOT')),
+                brick_layer=bool(os.environ.get('BRICKGAME_BRICK_LAYER')),
+                quality=quality, broadcast=broadcast or None)
+    if os.environ.get('BRICKGAME_LATENCY'):
+        game.latency_hook = lambda latency: print(
+            'input latency: %.1f ms' % (latency * 1000))
+
+    def close():
+        try:
+            game.shutdown()
+        finally:
+            root.destroy()
+
+    root.protocol('WM_DELETE_WINDOW', close)
+    game.mainloop()
@@ -0,0 +1,194 @@
+# Autopilot untuk paddle dan runner batch untuk menyeimbangkan level.
+#
+#   python autopilot.py --games 2000                 # semua core
+#   python autopilot.py --games 500 --speed 8 --workers 4
+#   python autopilot.py --level besar.lvl --swept
+#   python autopilot.py --games 2000 --baseline 100   # ukur speedup
+#
+# Setiap permainan dijalankan langsung di World (tanpa Tk) di proses
+# terpisah, lalu hasilnya dirangkum dalam satu tabel.
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from world import World, LEFT, RIGHT, LAUNCH, READY, PLAYING, BALL_LOST, WON
+
+
+class Autopilot(object):
+    # Memperkirakan titik jatuh bola di garis paddle (dengan pantulan dinding
+    # kiri/kanan/atas, brick diabaikan) lalu menggerakkan paddle ke sana.
+    # aim menggeser titik kena di paddle supaya sudut pantulan bervariasi.
+    def __init__(self, world, aim=0.0, deadband=None):
+        self.world = world
+        self.aim = aim
+        self.deadband = deadband or world.PADDLE_STEP / 2.0
+
+    def predict(self):
+        world = self.world
+        ball = world.ball
+        radius = ball.radius
+        low = radius
+        high = world.width - radius
+        target_y = world.paddle.get_position()[1] - radius
+        dx = ball.direction[0] * ball.speed
+        dy = ball.direction[1] * ball.speed
+        if dy == 0:
+            return ball.x
+        if dy > 0:
+            distance = target_y - ball.y
+        else:
+            # Naik dulu sampai dinding atas lalu turun ke paddle
+            distance = (ball.y - radius) + (target_y - radius)
+        x = ball.x + dx * abs(distance / dy)
+        # Lipat posisi x ke dalam lapangan sesuai pantulan dinding samping
+        span = high - low
+        if span <= 0:
+            return ball.x
+        offset = (x - low) % (2 * span)
+        if offset > span:
+            offset = 2 * span - offset
+        return low + offset
+
+    def actions(self):
+        world = self.world
+        if world.state == READY:
+            return [LAUNCH]
+        if world.state != PLAYING:
+            return []
+        target = self.predict() + self.aim
+        if world.paddle.x > target + self.deadband:
+            return [LEFT]
+        if world.paddle.x < target - self.deadband:
+            return [RIGHT]
+        return []
+
+
+_levels = {}
+
+
+def load_level(path):
+    # Level dibaca sekali per proses
+    if path not in _levels:
+        from levels import level_file
+        _levels[path] = level_file(path)
+    return _levels[path]
+
+
+def play_game(task):
+    seed, options = task
+    rng = random.Random(seed)
+    world = World(swept=options.get('swept', False),
+                  ball_speed=options.get('speed', 5))
+    if options.get('level'):
+        load_level(options['level'])(world)
+    else:
+        world.add_default_bricks()
+    pilot = Autopilot(world)
+    max_ticks = options.get('max_ticks', 60000)
+    lives = world.lives
+    # Waktu CPU proses, bukan wall time: saat worker berebut core, wall
+    # time per permainan ikut memanjang walau kerjanya sama
+    start = time.process_time()
+
+    def serve():
+        # Variasi per seed: posisi awal paddle, arah awal bola dan titik bidik
+        for _ in range(rng.randrange(0, 20)):
+            world.apply(rng.choice((LEFT, RIGHT)))
+        world.ball.direction[0] = rng.choice((-1, 1))
+        pilot.aim = rng.uniform(-30, 30)
+
+    serve()
+    while world.tick < max_ticks:
+        if world.state == BALL_LOST:
+            world.serve()
+            serve()
+        elif world.state not in (READY, PLAYING):
+            break
+        world.step(pilot.actions())
+    return {'seed': seed,
+            'won': world.state == WON,
+            'timeout': world.tick >= max_ticks,
+            'ticks': world.tick,
+            'lives_lost': lives - world.lives,
+            'bounces': world.paddle_bounces,
+            'bricks_left': world.bricks_left(),
+            'cpu': time.process_time() - start}
+
+
+def run_batch(games, workers=None, seed=0, **options):
+    workers = workers or os.cpu_count() or 1
+    tasks = [(seed + index, options) for index in range(games)]
+    if workers == 1:
+        return [play_game(task) for task in tasks]
+    # Chunk besar supaya biaya IPC kecil dibanding waktu simulasi
+    chunksize = max(1, games // (workers * 8))
+    with multiprocessing.Pool(workers) as pool:
+        return list(pool.imap_unordered(play_game, tasks, chunksize))
+
+
+def summarize(results, elapsed, workers, tick=0.05, baseline=None):
+    # baseline: games/s yang diukur dengan satu worker (lihat --baseline)
+    won = [r for r in results if r['won']]
+    clear = np.array([r['ticks'] * tick for r in won]) if won else np.zeros(1)
+    lives = np.array([r['lives_lost'] for r in results])
+    bounces = np.array([r['bounces'] for r in results])
+    cpu = sum(r['cpu'] for r in results)
+    rate = len(results) / max(elapsed, 1e-9)
+    rows = [
+        ('games', '%d' % len(results)),
+        ('won', '%d (%.1f%%)' % (len(won), 100.0 * len(won) / len(results))),
+        ('timeouts', '%d' % sum(1 for r in results if r['timeout'])),
+        ('clear time s', 'mean %.1f  p50 %.1f  p90 %.1f' % (
+            clear.mean(), np.percentile(clear, 50), np.percentile(clear, 90))),
+        ('lives lost', 'mean %.2f  max %d' % (lives.mean(), lives.max())),
+        ('paddle bounces', 'mean %.1f  p50 %.0f  p90 %.0f' % (
+            bounces.mean(), np.percentile(bounces, 50),
+            np.percentile(bounces, 90))),
+        ('workers', '%d' % workers),
+        ('wall time s', '%.2f (%.0f games/s, %.1f per worker)' % (
+            elapsed, rate, rate / workers)),
+        # CPU terpakai dibanding CPU yang tersedia untuk semua worker
+        ('cpu utilization', '%.0f%%' % (
+            100.0 * cpu / max(elapsed * workers, 1e-9))),
+    ]
+    if baseline:
+        rows.append(('speedup', '%.1fx vs 1 worker (%.0f games/s)' % (
+            rate / baseline, baseline)))
+    return '\n'.join('%-16s %s' % row for row in rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Self-play BrickGame')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--speed', type=float, default=5)
+    parser.add_argument('--swept', action='store_true')
+    parser.add_argument('--level')
+    parser.add_argument('--max-ticks', type=int, default=60000)
+    # Jumlah permainan untuk mengukur laju satu worker sebagai pembanding
+    parser.add_argument('--baseline', type=int, default=0)
+    args = parser.parse_args(argv)
+    options = dict(speed=args.speed, swept=args.swept, level=args.level,
+                   max_ticks=args.max_ticks)
+
+    baseline = None
+    if args.baseline:
+        start = time.perf_counter()
+        run_batch(args.baseline, 1, args.seed, **options)
+        baseline = args.baseline / (time.perf_counter() - start)
+    start = time.perf_counter()
+    results = run_batch(args.games, args.workers, args.seed, **options)
+    print(summarize(results, time.perf_counter() - start, args.workers,
+                    baseline=baseline))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
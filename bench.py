@@ -0,0 +1,347 @@
+# Benchmark BrickGame tanpa input manusia.
+#
+#   python bench.py                  # semua skenario
+#   python bench.py clear rally      # skenario tertentu
+#   python bench.py --stub --json hasil.json
+#   python bench.py --brick-layer    # brick digambar ke satu PhotoImage
+#   python bench.py --quality auto   # governor kualitas aktif (default: 3)
+#
+# Tanpa DISPLAY (atau dengan --stub) tkinter diganti kanvas tiruan yang
+# hanya mencatat item dan menghitung panggilan Tcl, sehingga benchmark bisa
+# jalan di mesin CI. Waktu permainan memakai jam virtual (satu tick fisika
+# per frame), jadi hasil setiap run dengan seed yang sama selalu identik.
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+import numpy as np
+
+
+class StubWidget(object):
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.tcl_calls = 0
+
+    def pack(self, **options):
+        pass
+
+    def after(self, ms, func=None, *args):
+        return None
+
+    def after_idle(self, func, *args):
+        return None
+
+    def after_cancel(self, after_id):
+        pass
+
+    def bind(self, sequence=None, func=None, add=None):
+        pass
+
+    def unbind(self, sequence, funcid=None):
+        pass
+
+    def focus_set(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def winfo_width(self):
+        return 1
+
+    def winfo_height(self):
+        return 1
+
+    def protocol(self, name=None, func=None):
+        pass
+
+    def title(self, string=None):
+        pass
+
+    def mainloop(self, n=0):
+        pass
+
+    def destroy(self):
+        pass
+
+
+class StubCanvas(StubWidget):
+    def __init__(self, master=None, **options):
+        super(StubCanvas, self).__init__(master, **options)
+        self.items = {}
+        self.next_id = 1
+
+    def create(self, coords, options):
+        self.tcl_calls += 1
+        item = self.next_id
+        self.next_id += 1
+        if len(coords) == 1:
+            coords = coords[0]
+        self.items[item] = [list(coords), options]
+        return item
+
+    def create_oval(self, *coords, **options):
+        return self.create(coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self.create(coords, options)
+
+    def create_text(self, *coords, **options):
+        return self.create(coords, options)
+
+    def create_image(self, *coords, **options):
+        return self.create(coords, options)
+
+    def coords(self, item, *coords):
+        self.tcl_calls += 1
+        if not coords:
+            return list(self.items[item][0]) if item in self.items else []
+        if len(coords) == 1:
+            coords = coords[0]
+        self.items[item][0] = list(coords)
+
+    def move(self, item, x, y):
+        self.tcl_calls += 1
+        coords = self.items[item][0]
+        self.items[item][0] = [value + (x if index % 2 == 0 else y)
+                               for index, value in enumerate(coords)]
+
+    def delete(self, *items):
+        self.tcl_calls += 1
+        for item in items:
+            self.items.pop(item, None)
+
+    def itemconfig(self, item, **options):
+        self.tcl_calls += 1
+        if item in self.items:
+            self.items[item][1].update(options)
+
+    itemconfigure = itemconfig
+
+    def find_all(self):
+        self.tcl_calls += 1
+        return tuple(self.items)
+
+    def find_withtag(self, tag):
+        self.tcl_calls += 1
+        return tuple(item for item, (_, options) in self.items.items()
+                     if options.get('tags') == tag)
+
+
+class StubPhotoImage(object):
+    def __init__(self, width=0, height=0, **options):
+        self.width = width
+        self.height = height
+        self.puts = 0
+
+    def put(self, data, to=None):
+        self.puts += 1
+
+
+def install_stub():
+    stub = types.ModuleType('tkinter')
+    stub.Misc = stub.Tk = stub.Frame = StubWidget
+    stub.Canvas = StubCanvas
+    stub.PhotoImage = StubPhotoImage
+    stub.TclError = RuntimeError
+    sys.modules['tkinter'] = stub
+
+
+def follow(game):
+    # Autopilot sederhana: paddle mengejar posisi x bola utama
+    ball = game.world.ball
+    paddle = game.world.paddle
+    if paddle.x > ball.x + 5:
+        game.paddle.move(-10)
+    elif paddle.x < ball.x - 5:
+        game.paddle.move(10)
+
+
+def destroy_bricks(count):
+    # Menghancurkan beberapa brick per frame, masing-masing 20 partikel;
+    # tampilan, suara dan partikel menyusul lewat event di game_loop.
+    # Level diisi ulang sebelum habis supaya skenario berjalan sepanjang
+    # jumlah frame yang diminta (level yang menang menghentikan bench)
+    full = {}
+
+    def script(game):
+        world = game.world
+        if full.get('world') is not world:
+            # Skenario yang sama bisa dijalankan lagi dengan World baru
+            full.update(world=world, start=world.snapshot())
+        if world.live_bricks <= count:
+            # Hanya brick yang dikembalikan; bola, tick dan lainnya tetap
+            start = full['start']
+            now = world.snapshot()._replace(hits=start.hits,
+                                            live_bricks=start.live_bricks)
+            for state in world.restore(now):
+                game.refresh_brick(state)
+        alive = [brick for brick in world.bricks if brick.alive]
+        for brick in alive[:count]:
+            hits = []
+            while brick.alive:
+                world.hit_brick(brick, hits)
+    return script
+
+
+def out_of_reach(world):
+    # Satu brick di luar lapangan: level tidak pernah selesai, cocok untuk
+    # reli panjang yang hanya mengukur bola, ekor dan paddle
+    world.add_brick(-1000, -1000, 3)
+
+
+def one_hit_rows(rows, columns, top=40):
+    def level(world):
+        width = world.width / columns
+        for row in range(rows):
+            for column in range(columns):
+                world.add_brick((column + 0.5) * width, top + row * 20 + 10,
+                                1, width - 1, 19)
+    return level
+
+
+def synthetic(columns, rows, top=40, height=5):
+    def level(world):
+        width = world.width / columns
+        for row in range(rows):
+            for column in range(columns):
+                world.add_brick((column + 0.5) * width,
+                                top + (row + 0.5) * height,
+                                1 + (row + column) % 3, width, height)
+    return level
+
+
+SCENARIOS = {
+    'clear': dict(level=None, script=None, frames=20000),
+    'destruction': dict(level=one_hit_rows(10, 16), script=destroy_bricks(8),
+                        frames=400),
+    'rally': dict(level=out_of_reach, script=None, frames=5000),
+    'large': dict(level=synthetic(60, 40), script=None, frames=3000),
+    'field5k': dict(level=synthetic(100, 50, height=4),
+                    script=destroy_bricks(2), frames=1000),
+}
+
+
+def run(name, frames=None, seed=1, memory=False, brick_layer=False,
+        quality=3):
+    from BrickGame import Game
+    import tkinter as tk
+    from world import PLAYING, BALL_LOST
+
+    scenario = SCENARIOS[name]
+    frames = frames or scenario['frames']
+    root = tk.Tk()
+    # fps = 20 dengan jam virtual: tepat satu tick fisika setiap frame
+    start = time.perf_counter()
+    game = Game(root, fps=20, seed=seed, level=scenario['level'],
+                brick_layer=brick_layer, quality=quality)
+    root.update_idletasks()
+    startup = time.perf_counter() - start
+    game.after = lambda *args: None
+    clock = [0.0]
+    game.timestep.clock = lambda: clock[0]
+    script = scenario['script']
+
+    if memory:
+        tracemalloc.start()
+    times = []
+    calls = 0
+    game.start_game()
+    for frame in range(frames):
+        state = game.world.state
+        if state == BALL_LOST:
+            game.setup_game()
+            game.start_game()
+        elif state != PLAYING:
+            break
+        start = time.perf_counter()
+        follow(game)
+        if script is not None:
+            script(game)
+        clock[0] += game.timestep.tick
+        game.game_loop()
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+        calls += game.renderer.frame_calls
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    root.destroy()
+
+    times = np.array(times)
+    p50, p95, p99 = np.percentile(times, (50, 95, 99))
+    return {'scenario': name,
+            'frames': len(times),
+            'bricks': len(game.world.bricks),
+            'brick_layer': brick_layer,
+            'canvas_items': len(game.renderer.kinds),
+            'quality': game.quality.level,
+            'state': game.world.state,
+            'fps': len(times) / times.sum(),
+            'p50_ms': p50 * 1000,
+            'p95_ms': p95 * 1000,
+            'p99_ms': p99 * 1000,
+            'max_ms': times.max() * 1000,
+            'tcl_calls_per_frame': calls / len(times),
+            'startup_ms': startup * 1000,
+            'peak_memory_kb': peak / 1024 if peak is not None else None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='BrickGame benchmark')
+    parser.add_argument('scenarios', nargs='*',
+                        help='pilihan: %s' % ', '.join(sorted(SCENARIOS)))
+    parser.add_argument('--frames', type=int)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--stub', action='store_true',
+                        help='pakai kanvas tiruan walaupun ada DISPLAY')
+    parser.add_argument('--json', help='simpan hasil ke file JSON')
+    parser.add_argument('--brick-layer', action='store_true',
+                        help='gambar brick ke satu PhotoImage (BrickLayer)')
+    parser.add_argument('--quality', default='3',
+                        help='level efek 0-3, atau auto untuk governor; '
+                             'level tetap membuat hasil bisa diulang')
+    args = parser.parse_args(argv)
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error('skenario tidak dikenal: %s' % name)
+
+    if args.stub or not os.environ.get('DISPLAY'):
+        install_stub()
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    quality = None if args.quality == 'auto' else int(args.quality)
+    results = []
+    for name in args.scenarios or sorted(SCENARIOS):
+        result = run(name, args.frames, args.seed,
+                     brick_layer=args.brick_layer, quality=quality)
+        # Pengukuran memori diulang terpisah karena tracemalloc memperlambat
+        traced = run(name, args.frames, args.seed, memory=True,
+                     brick_layer=args.brick_layer, quality=quality)
+        result['peak_memory_kb'] = traced['peak_memory_kb']
+        results.append(result)
+
+    print('%-12s %7s %7s %7s %2s %9s %8s %8s %8s %10s %10s %10s' % (
+        'scenario', 'frames', 'bricks', 'items', 'q', 'fps', 'p50 ms',
+        'p99 ms', 'max ms', 'tcl/frame', 'peak KB', 'start ms'))
+    for r in results:
+        print('%-12s %7d %7d %7d %2d %9.0f %8.3f %8.3f %8.3f %10.1f %10.0f '
+              '%10.1f' % (
+                  r['scenario'], r['frames'], r['bricks'], r['canvas_items'],
+                  r['quality'], r['fps'], r['p50_ms'], r['p99_ms'],
+                  r['max_ms'], r['tcl_calls_per_frame'], r['peak_memory_kb'],
+                  r['startup_ms']))
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(results, output, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
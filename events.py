@@ -0,0 +1,49 @@
+from collections import namedtuple
+
+# Event yang dikeluarkan World selama tick fisika. Isinya hanya data; semua
+# efek samping (kanvas, suara, partikel, HUD) dikerjakan oleh subscriber
+# sekali per frame di EventBus.dispatch.
+BrickHit = namedtuple('BrickHit', ['tick', 'brick'])
+BrickDestroyed = namedtuple('BrickDestroyed', ['tick', 'brick'])
+BallLost = namedtuple('BallLost', ['tick', 'lives'])
+LevelCleared = namedtuple('LevelCleared', ['tick'])
+
+
+def unique_bricks(events):
+    # Beberapa event untuk brick yang sama dalam satu frame cukup diproses
+    # sekali; urutan kemunculan pertama dipertahankan
+    bricks = {}
+    for event in events:
+        bricks.setdefault(event.brick.index, event.brick)
+    return list(bricks.values())
+
+
+class EventBus(object):
+    def __init__(self):
+        self.queue = []
+        self.subscribers = []
+        self.emitted = 0
+        self.dispatched = 0
+
+    def subscribe(self, kinds, handler):
+        # handler menerima list event dari jenis-jenis kinds dalam satu frame
+        self.subscribers.append((tuple(kinds), handler))
+
+    def emit(self, event):
+        self.queue.append(event)
+        self.emitted += 1
+
+    def clear(self):
+        self.queue = []
+
+    def dispatch(self):
+        if not self.queue:
+            return 0
+        events = self.queue
+        self.queue = []
+        for kinds, handler in self.subscribers:
+            batch = [event for event in events if isinstance(event, kinds)]
+            if batch:
+                handler(batch)
+        self.dispatched += len(events)
+        return len(events)
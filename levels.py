@@ -0,0 +1,191 @@
+# Format level BrickGame.
+#
+# File biner (.lvl): header 'BRKL' + versi + jumlah brick (little-endian),
+# lalu satu record tetap 21 byte per brick (lihat RECORD). Warna 0 berarti
+# warna mengikuti jumlah hit seperti brick bawaan, selain itu 0xRRGGBB + 1<<24.
+#
+# File teks (.txt) untuk membuat level dengan tangan, satu brick per baris
+# (baris yang diawali '#' adalah komentar):
+#   x y hits [width height [#rrggbb]]
+# hits harus 1..MAX_HITS; level dengan nilai lain ditolak saat dimuat.
+# Saat dimuat, hasil parse disimpan sebagai cache biner di sebelahnya
+# (nama.txt.lvl) sehingga load berikutnya langsung lewat memory map.
+#
+#   python levels.py generate besar.lvl 50000
+#   python levels.py stats besar.lvl
+
+import os
+import struct
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+MAGIC = b'BRKL'
+VERSION = 1
+HEADER = struct.Struct('<4sII')
+RECORD = np.dtype([('x', '<f4'), ('y', '<f4'), ('width', '<f4'),
+                   ('height', '<f4'), ('hits', 'u1'), ('color', '<u4')])
+HAS_COLOR = 1 << 24
+MAX_HITS = 3
+
+
+def records(count):
+    return np.zeros(count, dtype=RECORD)
+
+
+def save_level(path, level):
+    with open(path, 'wb') as output:
+        output.write(HEADER.pack(MAGIC, VERSION, len(level)))
+        output.write(np.ascontiguousarray(level, dtype=RECORD).tobytes())
+
+
+def read_binary(path):
+    with open(path, 'rb') as source:
+        magic, version, count = HEADER.unpack(source.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('%s bukan file level versi %d' % (path, VERSION))
+    if count == 0:
+        return records(0)
+    return np.memmap(path, dtype=RECORD, mode='r', offset=HEADER.size,
+                     shape=(count,))
+
+
+def parse_text(path):
+    rows = []
+    with open(path) as source:
+        for number, line in enumerate(source, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            x, y, hits = float(fields[0]), float(fields[1]), int(fields[2])
+            if not 1 <= hits <= MAX_HITS:
+                raise ValueError('%s:%d: hits harus 1..%d, bukan %d' % (
+                    path, number, MAX_HITS, hits))
+            width = float(fields[3]) if len(fields) > 3 else 75
+            height = float(fields[4]) if len(fields) > 4 else 20
+            color = 0
+            if len(fields) > 5:
+                color = int(fields[5].lstrip('#'), 16) | HAS_COLOR
+            rows.append((x, y, width, height, hits, color))
+    return np.array(rows, dtype=RECORD)
+
+
+def load_level(path):
+    if path.endswith('.lvl'):
+        return read_binary(path)
+    cache = path + '.lvl'
+    if (os.path.exists(cache) and
+            os.path.getmtime(cache) >= os.path.getmtime(path)):
+        return read_binary(cache)
+    level = parse_text(path)
+    write_cache(cache, level)
+    return level
+
+
+def write_cache(cache, level):
+    try:
+        # File sementara lalu os.replace: pembaca lain tidak pernah melihat
+        # cache yang setengah tertulis
+        temporary = '%s.%d.tmp' % (cache, os.getpid())
+        save_level(temporary, level)
+        os.replace(temporary, cache)
+    except OSError:
+        # Cache hanya optimasi; level tetap dipakai dari hasil parse
+        pass
+
+
+def color_name(value):
+    if not value & HAS_COLOR:
+        return None
+    return '#%06x' % (value & 0xFFFFFF)
+
+
+def check_hits(level):
+    # File biner bisa dibuat di luar levels.py, jadi dicek lagi sebelum dipakai
+    bad = np.flatnonzero((level['hits'] < 1) | (level['hits'] > MAX_HITS))
+    if len(bad):
+        raise ValueError('brick %d: hits harus 1..%d, bukan %d' % (
+            bad[0], MAX_HITS, level['hits'][bad[0]]))
+
+
+def apply_level(world, level):
+    check_hits(level)
+    # Konversi ke list Python sekali saja; jauh lebih cepat daripada
+    # mengambil field numpy satu per satu untuk puluhan ribu brick
+    columns = [level[name].tolist() for name in RECORD.names]
+    # Ukuran brick biasanya hanya beberapa nilai; objek float yang sama
+    # dipakai bersama supaya tidak ada dua float baru per brick
+    shared = {}
+    for x, y, width, height, hits, color in zip(*columns):
+        width = shared.setdefault(width, width)
+        height = shared.setdefault(height, height)
+        world.add_brick(x, y, hits, width, height,
+                        color_name(color) if color else None)
+
+
+def level_file(path):
+    # Dipakai sebagai Game(level=level_file('nama.lvl'))
+    def level(world):
+        apply_level(world, load_level(path))
+    return level
+
+
+def generate(count, width=610, columns=None, top=20, height=4):
+    columns = columns or max(1, int(np.sqrt(count * 2)))
+    index = np.arange(count)
+    level = records(count)
+    brick_width = float(width) / columns
+    level['x'] = (index % columns + 0.5) * brick_width
+    level['y'] = top + (index // columns + 0.5) * height
+    level['width'] = brick_width
+    level['height'] = height
+    level['hits'] = 1 + index % 3
+    return level
+
+
+def stats(path):
+    from world import World
+
+    start = time.perf_counter()
+    level = load_level(path)
+    read_time = time.perf_counter() - start
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    world = World()
+    apply_level(world, level)
+    build_time = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Ukur ulang tanpa tracemalloc karena tracemalloc memperlambat alokasi
+    start = time.perf_counter()
+    apply_level(World(), load_level(path))
+    load_time = time.perf_counter() - start
+
+    count = len(level)
+    print('bricks          %d' % count)
+    print('file            %.1f KB (%d byte/brick)' % (
+        os.path.getsize(path) / 1024.0, RECORD.itemsize))
+    print('read            %.1f ms' % (read_time * 1000))
+    print('load total      %.1f ms' % (load_time * 1000))
+    print('load (traced)   %.1f ms' % (build_time * 1000))
+    print('memory          %.1f MB (%d byte/brick)' % (
+        memory / 1048576.0, memory // max(count, 1)))
+
+
+def main(argv):
+    if len(argv) == 3 and argv[0] == 'generate':
+        save_level(argv[1], generate(int(argv[2])))
+    elif len(argv) == 2 and argv[0] == 'stats':
+        stats(argv[1])
+    else:
+        print('pakai: levels.py generate FILE JUMLAH | levels.py stats FILE')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
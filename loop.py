@@ -0,0 +1,50 @@
+import time
+
+
+class FixedTimestep(object):
+    # Fisika selalu maju dengan langkah tetap (tick), terlepas dari berapa
+    # lama satu frame Tk berjalan. Waktu nyata dikumpulkan di accumulator
+    # dan dibayar dengan beberapa tick sekaligus bila frame terlambat.
+    def __init__(self, tick=0.05, fps=60, max_steps=5, clock=time.perf_counter):
+        self.tick = tick
+        self.frame_time = 1.0 / fps
+        self.max_steps = max_steps
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.last = None
+        self.next_frame = None
+        self.accumulator = 0.0
+        self.dropped = 0
+
+    def advance(self):
+        now = self.clock()
+        if self.last is None:
+            # Frame pertama langsung menjalankan satu tick
+            self.last = now
+            self.next_frame = now
+            self.accumulator = self.tick
+        self.accumulator += now - self.last
+        self.last = now
+        steps = int(self.accumulator // self.tick)
+        if steps > self.max_steps:
+            # Terlalu jauh tertinggal: sisa waktu dibuang, bukan dikejar
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.tick
+        else:
+            self.accumulator -= steps * self.tick
+        return steps
+
+    def alpha(self):
+        # Posisi di antara dua tick, dipakai untuk interpolasi saat render
+        return min(self.accumulator / self.tick, 1.0)
+
+    def next_delay(self):
+        # Milidetik sampai frame berikutnya sesuai target fps
+        now = self.clock()
+        self.next_frame += self.frame_time
+        if self.next_frame < now:
+            self.next_frame = now
+        return int((self.next_frame - now) * 1000)
@@ -0,0 +1,94 @@
+# Audit memori untuk scene besar.
+#
+#   python memaudit.py                 # scene 10k dan 100k
+#   python memaudit.py 50000 200000
+#
+# Setiap baris diukur dengan tracemalloc (heap Python saja; item kanvas Tk
+# tidak ikut), dan kanvas memakai stub dari bench.py supaya tidak perlu
+# DISPLAY. Kolom "gc objs" adalah jumlah objek baru yang dilacak GC, yang
+# menentukan berapa lama satu putaran GC penuh berjalan.
+
+import gc
+import os
+import sys
+import tracemalloc
+
+DEFAULT_SIZES = (10000, 100000)
+
+
+def measure(build):
+    gc.collect()
+    objects = len(gc.get_objects())
+    tracemalloc.start()
+    result = build()
+    heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, heap, len(gc.get_objects()) - objects
+
+
+def world_scene(count):
+    from levels import apply_level, generate
+    from world import World
+
+    level = generate(count)
+    world = World()
+    apply_level(world, level)
+    return world
+
+
+def particle_scene(count):
+    from particles import ParticlePool
+
+    pool = ParticlePool(capacity=count)
+    for _ in range(count // 20):
+        pool.burst(300, 200, '#4535AA')
+    return pool
+
+
+def empty_game():
+    import itertools
+    import tkinter as tk
+    from BrickGame import Game
+
+    game = Game(tk.Tk(), audio=False, level=lambda target: None, seed=1)
+    # Item kanvas tiruan tidak ikut dihitung; di Tk asli item ada di sisi Tcl
+    ids = itertools.count(1000)
+    game.canvas.create = lambda coords, options: next(ids)
+    return game
+
+
+def view_scene(game, world):
+    # View Brick untuk semua brick sekaligus (dalam permainan hanya brick
+    # yang terlihat atau pernah kena yang punya view)
+    return [game.add_brick(state) for state in world.bricks]
+
+
+def audit(count):
+    world, heap, objects = measure(lambda: world_scene(count))
+    rows = [('world bricks', count, heap, objects)]
+    game = empty_game()
+    _, heap, objects = measure(lambda: view_scene(game, world))
+    rows.append(('brick views', count, heap, objects))
+    _, heap, objects = measure(lambda: particle_scene(count))
+    rows.append(('particles', count, heap, objects))
+    return rows
+
+
+def main(argv):
+    from bench import install_stub
+
+    install_stub()
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    print('%-14s %8s %10s %10s %10s' % (
+        'scene', 'entities', 'heap MB', 'byte/ent', 'gc objs'))
+    for count in sizes:
+        for name, entities, heap, objects in audit(count):
+            print('%-14s %8d %10.2f %10.0f %10d' % (
+                name, entities, heap / 1048576.0, heap / float(entities),
+                objects))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+
+
+class BallArray(object):
+    # Bola tambahan (power-up multi-ball / mode stres) disimpan sebagai array.
+    # Gerak, pantulan dinding, tes paddle dan bola jatuh dihitung sekaligus
+    # untuk semua bola; hanya bola yang benar-benar menyentuh paddle atau
+    # berada di area brick yang diproses satu per satu.
+    def __init__(self, capacity=512, radius=10, speed=5):
+        self.capacity = capacity
+        self.radius = radius
+        self.speed = speed
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def spawn(self, x, y, dx, dy):
+        count = np.broadcast(x, y, dx, dy).size
+        slots = np.flatnonzero(~self.alive)[:count]
+        n = len(slots)
+        self.x[slots] = np.broadcast_to(x, (count,))[:n]
+        self.y[slots] = np.broadcast_to(y, (count,))[:n]
+        self.dx[slots] = np.broadcast_to(dx, (count,))[:n]
+        self.dy[slots] = np.broadcast_to(dy, (count,))[:n]
+        self.alive[slots] = True
+        return slots
+
+    def spread(self, x, y, count):
+        # Arah disebar rata ke atas, besarnya sama dengan arah diagonal [1, -1]
+        angles = np.linspace(math.radians(30), math.radians(150), count + 2)[1:-1]
+        return self.spawn(x, y, math.sqrt(2) * np.cos(angles),
+                          -math.sqrt(2) * np.sin(angles))
+
+    def live_slots(self):
+        return np.flatnonzero(self.alive)
+
+    def live_count(self):
+        return int(np.count_nonzero(self.alive))
+
+    def bounds(self, slot):
+        r = self.radius
+        return (self.x[slot] - r, self.y[slot] - r,
+                self.x[slot] + r, self.y[slot] + r)
+
+    def step(self, world):
+        # Urutan sama dengan bola utama: tabrakan, cek jatuh, lalu bergerak
+        r = self.radius
+        alive = self.alive
+        paddle = world.paddle.get_position()
+        near_paddle = alive & ((self.x + r >= paddle[0]) &
+                               (self.x - r <= paddle[2]) &
+                               (self.y + r >= paddle[1]) &
+                               (self.y - r <= paddle[3]))
+        region = world.brick_region
+        near_bricks = alive & ((self.x + r >= region[0]) &
+                               (self.x - r <= region[2]) &
+                               (self.y + r >= region[1]) &
+                               (self.y - r <= region[3]))
+        hits = []
+        for slot in np.flatnonzero(near_paddle | near_bricks):
+            hits.extend(self.collide(world, slot, near_paddle[slot]))
+
+        lost = np.flatnonzero(alive & (self.y + r >= world.height))
+        alive[lost] = False
+
+        flip_x = alive & ((self.x - r <= 0) | (self.x + r >= world.width))
+        flip_y = alive & (self.y - r <= 0)
+        self.dx[flip_x] *= -1
+        self.dy[flip_y] *= -1
+        self.x[alive] += self.dx[alive] * self.speed
+        self.y[alive] += self.dy[alive] * self.speed
+        return hits, lost
+
+    def collide(self, world, slot, on_paddle):
+        coords = self.bounds(slot)
+        objects = world.grid.query(coords)
+        if on_paddle:
+            objects.append(world.paddle)
+            world.paddle_bounces += 1
+        if len(objects) > 1:
+            self.dy[slot] *= -1
+        elif len(objects) == 1:
+            box = objects[0].get_position()
+            x = self.x[slot]
+            if x > box[2]:
+                self.dx[slot] = abs(self.dx[slot])
+            elif x < box[0]:
+                self.dx[slot] = -abs(self.dx[slot])
+            else:
+                self.dy[slot] *= -1
+        return [brick for brick in objects if brick is not world.paddle]
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class ParticlePool(object):
+    # Semua partikel (pecahan brick dan ekor bola) disimpan dalam array
+    # berkapasitas tetap; slot yang mati dipakai ulang, bukan dihapus.
+    def __init__(self, capacity=2048, seed=None):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.int16)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.palette = []
+        self.color_index = {}
+        self.dropped = 0
+
+    def color_id(self, color):
+        if color not in self.color_index:
+            self.color_index[color] = len(self.palette)
+            self.palette.append(color)
+        return self.color_index[color]
+
+    def spawn(self, x, y, vx, vy, size, life, color):
+        count = np.broadcast(x, y, vx, vy).size
+        slots = np.flatnonzero(~self.alive)[:count]
+        if len(slots) < count:
+            # Pool penuh: partikel yang tidak muat dibuang saja (hanya efek)
+            self.dropped += count - len(slots)
+        n = len(slots)
+        self.x[slots] = np.broadcast_to(x, (count,))[:n]
+        self.y[slots] = np.broadcast_to(y, (count,))[:n]
+        self.vx[slots] = np.broadcast_to(vx, (count,))[:n]
+        self.vy[slots] = np.broadcast_to(vy, (count,))[:n]
+        self.size[slots] = size
+        self.life[slots] = life
+        self.color[slots] = self.color_id(color)
+        self.alive[slots] = True
+        return slots
+
+    def burst(self, x, y, color, count=20, speed=6, size=10, life=40):
+        # Pecahan brick: arah acak, mengecil 0.25 px per sisi setiap tick
+        vx = (self.rng.random(count) - 0.5) * speed
+        vy = (self.rng.random(count) - 0.5) * speed
+        return self.spawn(x, y, vx, vy, size, life, color)
+
+    def trail(self, x, y, vx, vy, count=2, size=5, life=10):
+        # Kecepatan ekor sedikit lebih lambat dari bola
+        xs = np.full(count, float(x))
+        return self.spawn(xs, y, vx * 0.5, vy * 0.5, size, life, 'white')
+
+    def update(self):
+        # Satu langkah untuk semua slot sekaligus; mengembalikan slot yang mati
+        self.life -= 1
+        dead = np.flatnonzero(self.alive & (self.life <= 0))
+        self.alive[dead] = False
+        self.x += self.vx
+        self.y += self.vy
+        self.size -= 0.25
+        return dead
+
+    def limit_life(self, life):
+        # Dipakai saat kualitas diturunkan: partikel yang masih panjang
+        # umurnya langsung dipendekkan
+        np.minimum(self.life, life, out=self.life)
+
+    def live_slots(self):
+        return np.flatnonzero(self.alive)
+
+    def live_count(self):
+        return int(np.count_nonzero(self.alive))
+
+    def bounds(self, slot):
+        size = self.size[slot]
+        return (self.x[slot] - size, self.y[slot] - size,
+                self.x[slot] + size, self.y[slot] + size)
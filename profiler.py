@@ -0,0 +1,70 @@
+import csv
+import json
+import time
+
+import numpy as np
+
+PHASES = ('step', 'hits', 'sound', 'ball', 'particles', 'draw', 'flush',
+          'redraw')
+COLUMNS = (('frame', 'start', 'total') + PHASES +
+           ('ticks', 'items', 'particles_live', 'tcl_calls'))
+
+
+class FrameProfiler(object):
+    # Waktu per fase untuk setiap frame disimpan di ring buffer berukuran
+    # tetap. Game hanya memanggil profiler bila diaktifkan, jadi saat mati
+    # biayanya cuma satu pengecekan None per fase.
+    def __init__(self, capacity=3600, clock=time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+        self.data = np.zeros((capacity, len(COLUMNS)))
+        self.column = dict((name, index) for index, name in enumerate(COLUMNS))
+        self.count = 0
+        self.row = np.zeros(len(COLUMNS))
+        self.origin = clock()
+        self.started = self.last = self.origin
+
+    def begin(self):
+        self.row[:] = 0
+        self.started = self.last = self.clock()
+
+    def mark(self, phase):
+        # Waktu sejak mark sebelumnya dihitung sebagai milik fase ini
+        now = self.clock()
+        self.row[self.column[phase]] += now - self.last
+        self.last = now
+
+    def end(self, ticks, items, particles, calls):
+        row = self.row
+        row[self.column['frame']] = self.count
+        row[self.column['start']] = self.started - self.origin
+        row[self.column['total']] = self.clock() - self.started
+        row[self.column['ticks']] = ticks
+        row[self.column['items']] = items
+        row[self.column['particles_live']] = particles
+        row[self.column['tcl_calls']] = calls
+        self.data[self.count % self.capacity] = row
+        self.count += 1
+
+    def frames(self):
+        # Isi ring buffer dari frame terlama ke terbaru
+        if self.count <= self.capacity:
+            return self.data[:self.count]
+        split = self.count % self.capacity
+        return np.concatenate((self.data[split:], self.data[:split]))
+
+    def percentiles(self, window=120, points=(50, 99)):
+        totals = self.frames()[-window:, self.column['total']]
+        if not len(totals):
+            return [0.0] * len(points)
+        return [float(value) for value in np.percentile(totals, points)]
+
+    def export(self, path):
+        rows = self.frames().tolist()
+        with open(path, 'w', newline='') as output:
+            if path.endswith('.json'):
+                json.dump([dict(zip(COLUMNS, row)) for row in rows], output)
+            else:
+                writer = csv.writer(output)
+                writer.writerow(COLUMNS)
+                writer.writerows(rows)
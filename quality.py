@@ -0,0 +1,71 @@
+from collections import deque
+
+
+class QualityGovernor(object):
+    # Menjaga waktu frame di bawah anggaran dengan mengurangi efek kosmetik
+    # (jumlah pecahan brick, kepadatan ekor bola, umur partikel). Fisika
+    # tidak pernah disentuh, jadi permainan tetap sama di mesin mana pun.
+    #
+    # Sampel yang dicatat adalah waktu sibuk satu frame: jarak antar frame
+    # dikurangi jeda after() yang memang diminta, jadi redraw Tk dan event
+    # lain ikut terhitung. Level turun bila rata-rata jendela melewati
+    # high * anggaran selama down_after frame berturut-turut, dan baru naik
+    # lagi setelah up_after frame di bawah low * anggaran (histeresis).
+    LEVELS = (
+        # burst, trail, skala umur
+        (4, 0, 0.5),
+        (8, 1, 0.5),
+        (12, 1, 0.75),
+        (20, 2, 1.0),  # kualitas penuh, sama dengan semula
+    )
+
+    def __init__(self, budget, level=None, adaptive=True, window=30,
+                 high=0.9, low=0.5, down_after=10, up_after=120):
+        self.budget = budget
+        self.adaptive = adaptive
+        self.times = deque(maxlen=window)
+        self.high = high
+        self.low = low
+        self.down_after = down_after
+        self.up_after = up_after
+        self.level = len(self.LEVELS) - 1 if level is None else level
+        self.over = 0
+        self.under = 0
+        self.changes = 0
+
+    def record(self, busy):
+        if not self.adaptive:
+            return self.level
+        self.times.append(busy)
+        average = sum(self.times) / len(self.times)
+        if average > self.budget * self.high:
+            self.over += 1
+            self.under = 0
+        elif average < self.budget * self.low:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+        if self.over >= self.down_after and self.level > 0:
+            self.set_level(self.level - 1)
+        elif self.under >= self.up_after and self.level < len(self.LEVELS) - 1:
+            self.set_level(self.level + 1)
+        return self.level
+
+    def set_level(self, level):
+        self.level = level
+        self.over = self.under = 0
+        # Sampel lama diukur dengan kualitas sebelumnya
+        self.times.clear()
+        self.changes += 1
+
+    @property
+    def burst(self):
+        return self.LEVELS[self.level][0]
+
+    @property
+    def trail(self):
+        return self.LEVELS[self.level][1]
+
+    def life(self, base):
+        return max(1, int(round(base * self.LEVELS[self.level][2])))
@@ -0,0 +1,226 @@
+import math
+import tkinter as tk
+
+
+class Playfield(object):
+    # Ukuran lapangan dalam koordinat World (logis) dan skalanya ke piksel
+    # kanvas. Hanya diperbarui dari event <Configure>, jadi game loop tidak
+    # pernah bertanya ukuran ke Tk. Skalanya seragam; sisa ruang dibagi rata
+    # di kedua sisi (letterbox).
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.pixel_width = width
+        self.pixel_height = height
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.identity = True
+
+    def configure(self, pixel_width, pixel_height):
+        # Mengembalikan True bila skala atau posisi lapangan berubah
+        if pixel_width < 1 or pixel_height < 1:
+            return False  # Jendela diminimalkan
+        if (pixel_width, pixel_height) == (self.pixel_width, self.pixel_height):
+            return False
+        self.pixel_width = pixel_width
+        self.pixel_height = pixel_height
+        self.scale = min(float(pixel_width) / self.width,
+                         float(pixel_height) / self.height)
+        self.offset_x = (pixel_width - self.width * self.scale) / 2
+        self.offset_y = (pixel_height - self.height * self.scale) / 2
+        self.identity = (self.scale == 1 and self.offset_x == 0 and
+                         self.offset_y == 0)
+        return True
+
+    def to_screen(self, coords):
+        if self.identity:
+            return tuple(coords)
+        scale = self.scale
+        offsets = (self.offset_x, self.offset_y)
+        return tuple(value * scale + offsets[index % 2]
+                     for index, value in enumerate(coords))
+
+    def font_size(self, size):
+        return max(1, int(round(int(size) * self.scale)))
+
+
+class Renderer(object):
+    # Semua perubahan kanvas dalam satu frame dikumpulkan dulu lalu dikirim
+    # ke Tk sekaligus di flush(): paling banyak satu coords dan satu
+    # itemconfig per item yang berubah. Item yang tidak dipakai disembunyikan
+    # dan disimpan untuk dipakai ulang, bukan dihapus.
+    #
+    # Koordinat yang diterima adalah koordinat World; bila ada Playfield,
+    # koordinat diproyeksikan ke piksel kanvas saat dikirim ke Tk.
+    def __init__(self, canvas, playfield=None):
+        self.canvas = canvas
+        self.playfield = playfield
+        self.free = {}
+        self.kinds = {}
+        self.current = {}
+        self.pending_coords = {}
+        self.pending_config = {}
+        self.pending_delete = []
+        self.calls = 0
+        self.frame_calls = 0
+        self.total_calls = 0
+        self.created = 0
+        self.reused = 0
+
+    def call(self, name, *args, **options):
+        # Setiap panggilan ke Tcl lewat sini supaya bisa dihitung
+        self.calls += 1
+        return getattr(self.canvas, name)(*args, **options)
+
+    def project(self, coords):
+        if self.playfield is None:
+            return coords
+        return self.playfield.to_screen(coords)
+
+    def scale(self):
+        return 1.0 if self.playfield is None else self.playfield.scale
+
+    def create(self, kind, coords, screen=False, **options):
+        # Posisi awal tidak dicatat di current: kebanyakan item (brick) tidak
+        # pernah dipindah, dan item yang dipindah hanya rugi satu coords.
+        # screen=True: coords sudah dalam piksel kanvas
+        if not screen:
+            coords = self.project(coords)
+        item = self.call('create_' + kind, *coords, **options)
+        self.kinds[item] = kind
+        self.created += 1
+        return item
+
+    def acquire(self, kind, coords, **options):
+        free = self.free.get(kind)
+        if not free:
+            return self.create(kind, coords, **options)
+        item = free.pop()
+        self.reused += 1
+        self.set_coords(item, *coords)
+        self.configure(item, state='normal', **options)
+        return item
+
+    def release(self, item):
+        self.pending_coords.pop(item, None)
+        self.configure(item, state='hidden')
+        self.free.setdefault(self.kinds[item], []).append(item)
+
+    def delete(self, item):
+        self.pending_coords.pop(item, None)
+        self.pending_config.pop(item, None)
+        self.current.pop(item, None)
+        self.kinds.pop(item, None)
+        self.pending_delete.append(item)
+
+    def reproject(self):
+        # Skala lapangan berubah: posisi yang sama pun harus dikirim ulang
+        self.current.clear()
+
+    def set_coords(self, item, *coords):
+        if self.current.get(item) == coords:
+            self.pending_coords.pop(item, None)
+        else:
+            self.pending_coords[item] = coords
+
+    def configure(self, item, **options):
+        self.pending_config.setdefault(item, {}).update(options)
+
+    def flush(self):
+        for item, coords in self.pending_coords.items():
+            self.call('coords', item, *self.project(coords))
+            self.current[item] = coords
+        for item, options in self.pending_config.items():
+            self.call('itemconfig', item, **options)
+        if self.pending_delete:
+            self.call('delete', *self.pending_delete)
+        self.pending_coords = {}
+        self.pending_config = {}
+        self.pending_delete = []
+        self.frame_calls = self.calls
+        self.total_calls += self.calls
+        self.calls = 0
+        return self.frame_calls
+
+
+class BrickLayer(object):
+    # Semua brick digambar sekali ke satu PhotoImage di bawah objek yang
+    # bergerak, jadi kanvas hanya punya satu item untuk seluruh lapangan
+    # brick. Brick yang kena hanya menandai kotaknya sebagai kotor; saat
+    # flush kotak itu diisi warna latar lalu brick hidup yang beririsan
+    # digambar ulang di dalamnya. Gambar dibuat dalam piksel layar, jadi
+    # dibuat ulang (layout) setiap kali skala lapangan berubah.
+    def __init__(self, renderer, world, background, fill, outline='black'):
+        self.renderer = renderer
+        self.world = world
+        self.grid = world.grid
+        self.background = background
+        self.fill = fill
+        self.outline = outline
+        self.image = None
+        self.item = None
+        self.dirty = []
+        self.painted = 0
+        self.layout()
+
+    def layout(self):
+        # Gambar hanya seluas area brick yang terlihat di lapangan
+        world = self.world
+        region = world.brick_region
+        if region[0] > region[2]:
+            region = [0, 0, 0, 0]  # Belum ada brick
+        region = (max(region[0], 0), max(region[1], 0),
+                  min(region[2], world.width), min(region[3], world.height))
+        x1, y1, x2, y2 = self.renderer.project(region)
+        self.left = int(math.floor(x1))
+        self.top = int(math.floor(y1))
+        self.width = max(int(math.ceil(x2)) + 1 - self.left, 1)
+        self.height = max(int(math.ceil(y2)) + 1 - self.top, 1)
+        self.image = tk.PhotoImage(width=self.width, height=self.height)
+        if self.item is None:
+            self.item = self.renderer.create('image', (self.left, self.top),
+                                             screen=True, image=self.image,
+                                             anchor='nw')
+        else:
+            self.renderer.call('coords', self.item, self.left, self.top)
+            self.renderer.call('itemconfig', self.item, image=self.image)
+        self.dirty = []
+        self.repaint(*region)
+
+    def box(self, coords):
+        # Koordinat World ke piksel gambar; outline Tk ikut menutup x2/y2
+        x1, y1, x2, y2 = self.renderer.project(coords)
+        return (max(int(round(x1)) - self.left, 0),
+                max(int(round(y1)) - self.top, 0),
+                min(int(round(x2)) + 1 - self.left, self.width),
+                min(int(round(y2)) + 1 - self.top, self.height))
+
+    def put(self, color, x1, y1, x2, y2, clip):
+        x1, y1 = max(x1, clip[0]), max(y1, clip[1])
+        x2, y2 = min(x2, clip[2]), min(y2, clip[3])
+        if x1 < x2 and y1 < y2:
+            # Dihitung sebagai panggilan Tcl seperti perubahan kanvas lain
+            self.renderer.calls += 1
+            self.image.put(color, to=(x1, y1, x2, y2))
+
+    def invalidate(self, state):
+        self.dirty.append(state.get_position())
+
+    def repaint(self, *coords):
+        clip = self.box(coords)
+        self.put(self.background, *clip, clip=clip)
+        # Outline satu piksel layar di luar kotak, dalam satuan World
+        pad = max(1.0, 1.0 / self.renderer.scale())
+        x1, y1, x2, y2 = coords
+        for brick in self.grid.query((x1 - pad, y1 - pad, x2 + pad, y2 + pad)):
+            x1, y1, x2, y2 = self.box(brick.get_position())
+            self.put(self.outline, x1, y1, x2, y2, clip)
+            self.put(self.fill(brick), x1 + 1, y1 + 1, x2 - 1, y2 - 1, clip)
+        self.painted += 1
+
+    def flush(self):
+        # Dipanggil sekali per frame sebelum Renderer.flush
+        for coords in self.dirty:
+            self.repaint(*coords)
+        self.dirty = []
@@ -0,0 +1,199 @@
+# Rekam dan putar ulang sesi permainan.
+#
+# File rekaman (.brr): header tetap (lihat HEADER) berisi seed partikel dan
+# konfigurasi World, lalu aliran event. Setiap event ditulis sebagai selisih
+# tick sejak event sebelumnya (varint) diikuti satu byte kode; event CHECK
+# membawa tambahan checksum World 4 byte. Satu jam permainan biasanya hanya
+# beberapa puluh KB.
+#
+#   python replay.py sesi.brr              # secepat mungkin tanpa render
+#   python replay.py sesi.brr --realtime   # kecepatan asli, tanpa jendela
+#   python replay.py sesi.brr --window     # kecepatan asli di jendela Tk
+
+import argparse
+import struct
+import sys
+import time
+
+from world import World, LEFT, RIGHT, LAUNCH, PLAYING
+
+MAGIC = b'BRKR'
+VERSION = 1
+HEADER = struct.Struct('<4sHQHHbBHH')
+CHECKSUM = struct.Struct('<I')
+CHECK_EVERY = 100
+
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+START = 3
+SERVE = 4
+CHECK = 5
+CODES = {LEFT: MOVE_LEFT, RIGHT: MOVE_RIGHT, LAUNCH: START}
+ACTIONS = dict((code, action) for action, code in CODES.items())
+
+
+class Divergence(Exception):
+    pass
+
+
+class Recorder(object):
+    def __init__(self, world, seed, check_every=CHECK_EVERY):
+        self.header = HEADER.pack(MAGIC, VERSION, seed, int(world.width),
+                                  int(world.height), world.lives,
+                                  world.swept, world.multiball_every,
+                                  world.launch_balls)
+        self.check_every = check_every
+        self.data = bytearray()
+        self.last_tick = 0
+        self.events = 0
+        # Checksum awal sekaligus memastikan level yang dipakai sama
+        self.check(world)
+
+    def write(self, tick, code):
+        delta = tick - self.last_tick
+        self.last_tick = tick
+        while delta >= 0x80:
+            self.data.append(delta & 0x7F | 0x80)
+            delta >>= 7
+        self.data.append(delta)
+        self.data.append(code)
+        self.events += 1
+
+    def record(self, tick, action):
+        self.write(tick, CODES[action])
+
+    def serve(self, tick):
+        self.write(tick, SERVE)
+
+    def check(self, world):
+        self.write(world.tick, CHECK)
+        self.data += CHECKSUM.pack(world.checksum())
+
+    def tick(self, world):
+        if world.tick % self.check_every == 0:
+            self.check(world)
+
+    def save(self, path, world=None):
+        if world is not None:
+            self.check(world)
+        with open(path, 'wb') as output:
+            output.write(self.header)
+            output.write(self.data)
+
+
+class Recording(object):
+    def __init__(self, seed, config, events):
+        self.seed = seed
+        self.config = config
+        self.events = events
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as source:
+            data = source.read()
+        fields = HEADER.unpack_from(data)
+        if fields[0] != MAGIC or fields[1] != VERSION:
+            raise ValueError('%s bukan rekaman versi %d' % (path, VERSION))
+        seed = fields[2]
+        config = dict(width=fields[3], height=fields[4], lives=fields[5],
+                      swept=bool(fields[6]), multiball_every=fields[7],
+                      launch_balls=fields[8])
+        events = []
+        tick = 0
+        offset = HEADER.size
+        while offset < len(data):
+            delta = shift = 0
+            while True:
+                byte = data[offset]
+                offset += 1
+                delta |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            tick += delta
+            code = data[offset]
+            offset += 1
+            value = None
+            if code == CHECK:
+                value = CHECKSUM.unpack_from(data, offset)[0]
+                offset += CHECKSUM.size
+            events.append((tick, code, value))
+        return cls(seed, config, events)
+
+    def world(self, level=None):
+        world = World(**self.config)
+        if level is None:
+            world.add_default_bricks()
+        else:
+            level(world)
+        return world
+
+
+def play(recording, level=None, realtime=False, tick=0.05, strict=True):
+    # Putar ulang langsung di World tanpa Tk; mengembalikan World akhir dan
+    # daftar tick tempat checksum tidak cocok
+    world = recording.world(level)
+    divergences = []
+    start = time.perf_counter()
+    for target, code, value in recording.events:
+        while world.tick < target:
+            if world.state != PLAYING:
+                raise Divergence('rekaman maju ke tick %d tapi permainan '
+                                 'berhenti di tick %d' % (target, world.tick))
+            world.step()
+            if realtime:
+                delay = start + world.tick * tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        if code == CHECK:
+            if world.checksum() != value:
+                divergences.append(target)
+                if strict:
+                    raise Divergence('checksum berbeda di tick %d' % target)
+        elif code == SERVE:
+            world.serve()
+        else:
+            world.apply(ACTIONS[code])
+    return world, divergences
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Putar ulang rekaman BrickGame')
+    parser.add_argument('recording')
+    parser.add_argument('--realtime', action='store_true')
+    parser.add_argument('--window', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.window:
+        import tkinter as tk
+        from BrickGame import Game
+        root = tk.Tk()
+        root.title('Break those Bricks! (replay)')
+        Game(root, replay=args.recording).mainloop()
+        return 0
+
+    recording = Recording.load(args.recording)
+    start = time.perf_counter()
+    try:
+        world, divergences = play(recording, realtime=args.realtime,
+                                  strict=False)
+    except Divergence as error:
+        print('DIVERGED: %s' % error)
+        return 1
+    elapsed = time.perf_counter() - start
+    checks = sum(1 for event in recording.events if event[1] == CHECK)
+    print('ticks        %d (%.1f s permainan)' % (world.tick, world.tick * 0.05))
+    print('events       %d, checksum %d' % (len(recording.events), checks))
+    print('elapsed      %.3f s (%.0fx)' % (
+        elapsed, world.tick * 0.05 / max(elapsed, 1e-9)))
+    print('state        %s, lives %d, bricks %d' % (
+        world.state, world.lives, world.bricks_left()))
+    if divergences:
+        print('DIVERGED at ticks %s' % divergences[:10])
+        return 1
+    print('ok: semua checksum cocok')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import threading
+import time
+import pygame
+
+
+def cache_directory():
+    return os.environ.get('BRICKGAME_CACHE') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'brickgame')
+
+
+class SoundBank(object):
+    # Efek suara didekode sekali lalu diputar lewat kanal tetap, supaya tidak
+    # ada dekode MP3 di dalam game loop. Mixer dibuka dan semua file
+    # didekode di thread latar (start()); selama belum siap, atau bila tidak
+    # ada perangkat audio sama sekali, permainan tetap jalan tanpa suara.
+    def __init__(self, voices=4, cache_dir=None):
+        self.voices = voices
+        self.cache_dir = cache_dir or cache_directory()
+        self.sounds = {}
+        self.decode_time = 0.0
+        self.cache_hits = 0
+        self.init_time = None
+        self.ready = False
+        self.available = None
+        self.thread = None
+        self.pending = []
+        self.pending_music = None
+        self.played = 0
+        self.merged = 0
+        self.stolen = 0
+        self.skipped = 0
+        self.channels = []
+        self.started = []
+        self.track_channel = None
+
+    def start(self, effects=(), tracks=(), music=None):
+        # effects/tracks: daftar (nama, path, volume); music: path lagu latar
+        # yang di-stream oleh pygame.mixer.music
+        self.thread = threading.Thread(target=self.load_all,
+                                       args=(effects, tracks, music))
+        self.thread.daemon = True
+        self.thread.start()
+        return self.thread
+
+    def load_all(self, effects, tracks, music):
+        start = time.perf_counter()
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error:
+            # Tidak ada perangkat audio: permainan tetap bisa dimainkan
+            self.available = False
+            return
+        # Kanal 0..voices-1 untuk efek, satu kanal lagi untuk lagu menang/kalah;
+        # semuanya dicadangkan agar tidak dipakai Sound.play() lain
+        if pygame.mixer.get_num_channels() < self.voices + 1:
+            pygame.mixer.set_num_channels(self.voices + 1)
+        pygame.mixer.set_reserved(self.voices + 1)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.voices)]
+        self.started = [0.0] * self.voices
+        self.track_channel = pygame.mixer.Channel(self.voices)
+        for name, path, volume in list(effects) + list(tracks):
+            self.load(name, path, volume)
+        if music is not None:
+            pygame.mixer.music.load(music)
+        self.init_time = time.perf_counter() - start
+        self.available = True
+        self.ready = True
+
+    def cache_path(self, path):
+        # Kunci cache: file sumber (path, ukuran, waktu ubah) dan format mixer
+        info = os.stat(path)
+        key = '%s:%d:%d:%r' % (os.path.abspath(path), info.st_size,
+                               int(info.st_mtime), pygame.mixer.get_init())
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, '%s-%s.pcm' % (
+            os.path.basename(path), digest))
+
+    def load(self, name, path, volume=1.0):
+        start = time.perf_counter()
+        cache = self.cache_path(path)
+        if os.path.exists(cache):
+            # PCM hasil dekode sebelumnya: tidak perlu dekode MP3 lagi
+            with open(cache, 'rb') as source:
+                sound = pygame.mixer.Sound(buffer=source.read())
+            self.cache_hits += 1
+        else:
+            sound = pygame.mixer.Sound(path)
+            self.write_cache(cache, sound.get_raw())
+        self.decode_time += time.perf_counter() - start
+        sound.set_volume(volume)
+        self.sounds[name] = sound
+        return sound
+
+    def write_cache(self, cache, data):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temporary = '%s.%d.tmp' % (cache, os.getpid())
+            with open(temporary, 'wb') as output:
+                output.write(data)
+            os.replace(temporary, cache)
+        except OSError:
+            # Cache hanya optimasi; gagal menulis tidak apa-apa
+            pass
+
+    def play(self, name):
+        if not self.ready:
+            self.skipped += 1
+            return
+        # Hanya dicatat; beberapa hit pada frame yang sama digabung jadi satu
+        if name in self.pending:
+            self.merged += 1
+        else:
+            self.pending.append(name)
+
+    def flush(self):
+        # Dipanggil sekali per frame dari game loop
+        if not self.ready:
+            return
+        if self.pending_music is not None:
+            self.play_music(*self.pending_music)
+        for name in self.pending:
+            index = self.free_channel()
+            self.channels[index].play(self.sounds[name])
+            self.started[index] = time.perf_counter()
+            self.played += 1
+        self.pending = []
+
+    def free_channel(self):
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+        # Semua kanal penuh: pakai ulang suara yang paling lama berjalan
+        self.stolen += 1
+        return self.started.index(min(self.started))
+
+    def play_music(self, volume=0.75, loops=-1):
+        # Bila mixer belum siap, lagu diputar pada flush() pertama setelah siap
+        if not self.ready:
+            if self.available is not False:
+                self.pending_music = (volume, loops)
+            return
+        self.pending_music = None
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops, 0.0)
+
+    def play_track(self, name):
+        # Lagu menang/kalah sudah didekode di depan, jadi langsung diputar
+        self.pending_music = None
+        if not self.ready:
+            return
+        pygame.mixer.music.stop()
+        self.track_channel.play(self.sounds[name])
+
+    def active_voices(self):
+        return sum(1 for channel in self.channels if channel.get_busy())
+
+    def stats(self):
+        return {'available': self.available,
+                'init_time': self.init_time,
+                'decode_time': self.decode_time,
+                'cache_hits': self.cache_hits,
+                'active_voices': self.active_voices(),
+                'played': self.played,
+                'merged': self.merged,
+                'stolen': self.stolen,
+                'skipped': self.skipped}
@@ -0,0 +1,552 @@
+# Siaran permainan ke layar penonton di LAN.
+#
+# Broadcaster menjalankan server asyncio di thread sendiri; game loop hanya
+# memanggil publish(world) sekali per tick, yang menyandikan delta lalu
+# menaruhnya di antrean; thread siaran yang mengirim ke jaringan.
+#
+# Setiap pesan diawali panjang u32. Isinya satu byte jenis lalu:
+#   LEVEL  lebar, tinggi, jumlah brick, lalu record levels.RECORD per brick
+#          (dikirim sekali saat penonton tersambung)
+#   KEY    FRAME + sisa hit semua brick (1 byte per brick)
+#   DELTA  FRAME + jumlah brick yang berubah + (index u32, hit u8) per brick
+# FRAME berisi tick, state, nyawa, posisi bola, x paddle dan bola tambahan.
+# Penonton yang lambat (buffer kirim penuh) dilewati dan baru dikirimi lagi
+# mulai KEY berikutnya, jadi satu penonton tidak bisa menahan yang lain.
+#
+#   BRICKGAME_BROADCAST=0.0.0.0:7777 python BrickGame.py
+#   python spectate.py view 192.168.1.20:7777 [--window]
+#   python spectate.py test                 # localhost, tanpa jendela
+
+import argparse
+import asyncio
+import multiprocessing
+import struct
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from levels import HAS_COLOR, RECORD, records
+from world import READY, PLAYING, BALL_LOST, WON, LOST
+
+LEVEL = 1
+KEY = 2
+DELTA = 3
+KEY_EVERY = 100
+
+STATES = (READY, PLAYING, BALL_LOST, WON, LOST)
+CODES = dict((state, code) for code, state in enumerate(STATES))
+
+LENGTH = struct.Struct('<I')
+LEVEL_HEADER = struct.Struct('<BffI')
+FRAME = struct.Struct('<BIBbfffH')
+COUNT = struct.Struct('<I')
+CHANGE = np.dtype([('index', '<u4'), ('hits', 'u1')])
+POSITION = np.dtype([('x', '<f4'), ('y', '<f4')])
+
+
+def parse_address(address, default_host='127.0.0.1'):
+    host, _, port = address.rpartition(':')
+    return host or default_host, int(port)
+
+
+def encode_level(world):
+    level = records(len(world.bricks))
+    for index, brick in enumerate(world.bricks):
+        color = 0
+        if brick.color:
+            color = int(brick.color.lstrip('#'), 16) | HAS_COLOR
+        level[index] = (brick.x, brick.y, brick.width, brick.height,
+                        brick.hits, color)
+    return (LEVEL_HEADER.pack(LEVEL, world.width, world.height, len(level)) +
+            level.tobytes())
+
+
+def encode_frame(kind, world):
+    ball = world.ball
+    extra = world.extra_balls
+    slots = extra.live_slots()
+    positions = np.empty(len(slots), dtype=POSITION)
+    positions['x'] = extra.x[slots]
+    positions['y'] = extra.y[slots]
+    return FRAME.pack(kind, world.tick, CODES[world.state], world.lives,
+                      ball.x, ball.y, world.paddle.x,
+                      len(slots)) + positions.tobytes()
+
+
+class Client(object):
+    def __init__(self, writer):
+        self.writer = writer
+        self.needs_key = True
+        self.task = asyncio.current_task()
+
+
+class Broadcaster(object):
+    def __init__(self, world, host='127.0.0.1', port=7777,
+                 key_every=KEY_EVERY, max_buffer=256 * 1024,
+                 drain_every=0.005):
+        self.level = encode_level(world)
+        self.host = host
+        self.port = port
+        self.key_every = key_every
+        self.max_buffer = max_buffer
+        self.drain_every = drain_every
+        # Antrean dari game loop ke thread siaran. publish hanya menambah ke
+        # deque (tanpa syscall dan tanpa membangunkan thread lain, yang bisa
+        # membuat game loop menunggu GIL); thread siaran mengurasnya sendiri
+        # setiap drain_every detik
+        self.pending = deque()
+        self.clients = set()
+        self.want_key = False
+        self.hits = bytes(world.hit_counts)
+        self.last_key = None
+        self.loop = None
+        self.server = None
+        self.ready = threading.Event()
+        self.error = None
+        self.thread = None
+        # Statistik: ukuran pesan dan waktu publish di thread game loop
+        self.published = 0
+        self.delta_bytes = 0
+        self.deltas = 0
+        self.key_bytes = 0
+        self.keys = 0
+        self.dropped = 0
+        self.publish_times = deque(maxlen=3600)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            # Misalnya port sudah dipakai; thread siaran sudah berhenti
+            self.thread.join()
+            self.loop = None
+            raise self.error
+        return self
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(
+                self.connected, self.host, self.port))
+            # Port 0: pakai port yang dipilih sistem
+            self.port = self.server.sockets[0].getsockname()[1]
+        except Exception as error:
+            self.error = error
+            self.loop.close()
+            return
+        finally:
+            self.ready.set()
+        self.loop.call_soon(self.drain)
+        self.loop.run_forever()
+
+    def drain(self):
+        self.flush()
+        self.loop.call_later(self.drain_every, self.drain)
+
+    def flush(self):
+        pending = self.pending
+        while pending:
+            self.fanout(*pending.popleft())
+
+    async def connected(self, reader, writer):
+        client = Client(writer)
+        writer.write(LENGTH.pack(len(self.level)) + self.level)
+        self.clients.add(client)
+        self.want_key = True
+        try:
+            while await reader.read(1024):
+                pass  # Penonton tidak mengirim apa-apa
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            writer.close()
+
+    def publish(self, world):
+        # Dipanggil dari game loop; hanya menyandikan lalu menyerahkan
+        if not self.clients:
+            return
+        start = time.perf_counter()
+        key = None
+        if self.want_key or world.tick - (self.last_key or 0) >= self.key_every:
+            self.want_key = False
+            self.last_key = world.tick
+            hits = bytes(world.hit_counts)
+            body = encode_frame(KEY, world) + COUNT.pack(len(hits)) + hits
+            key = LENGTH.pack(len(body)) + body
+            self.key_bytes += len(key)
+            self.keys += 1
+            self.hits = hits
+            delta = None
+        else:
+            body = encode_frame(DELTA, world)
+            if world.hit_counts == self.hits:
+                body += COUNT.pack(0)  # Kebanyakan tick tidak ada brick kena
+            else:
+                hits = bytes(world.hit_counts)
+                changed = np.flatnonzero(
+                    np.frombuffer(hits, dtype=np.uint8) !=
+                    np.frombuffer(self.hits, dtype=np.uint8))
+                self.hits = hits
+                pairs = np.empty(len(changed), dtype=CHANGE)
+                pairs['index'] = changed
+                pairs['hits'] = np.frombuffer(hits, np.uint8)[changed]
+                body += COUNT.pack(len(changed)) + pairs.tobytes()
+            delta = LENGTH.pack(len(body)) + body
+            self.delta_bytes += len(delta)
+            self.deltas += 1
+        self.pending.append((delta, key))
+        self.published += 1
+        self.publish_times.append(time.perf_counter() - start)
+
+    def fanout(self, delta, key):
+        # Berjalan di thread siaran
+        for client in list(self.clients):
+            transport = client.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > self.max_buffer:
+                # Penonton terlalu lambat: lewati sampai buffernya kosong
+                # lagi, lalu sinkronkan dengan KEY
+                client.needs_key = True
+                self.dropped += 1
+            elif key is not None:
+                client.writer.write(key)
+                client.needs_key = False
+            elif client.needs_key:
+                self.want_key = True
+            else:
+                client.writer.write(delta)
+
+    def stats(self):
+        times = np.array(self.publish_times or [0.0])
+        return {'clients': len(self.clients),
+                'published': self.published,
+                'delta_bytes_mean': self.delta_bytes / max(self.deltas, 1),
+                'key_bytes_mean': self.key_bytes / max(self.keys, 1),
+                'keys': self.keys,
+                'dropped': self.dropped,
+                'publish_us_mean': float(times.mean()) * 1e6,
+                'publish_us_p50': float(np.percentile(times, 50)) * 1e6,
+                'publish_us_p99': float(np.percentile(times, 99)) * 1e6}
+
+    def close(self):
+        if self.loop is None:
+            return
+
+        async def shutdown():
+            self.flush()
+            self.server.close()
+            clients = list(self.clients)
+            for client in clients:
+                client.writer.close()
+            if clients:
+                # Sisa buffer dikirim dulu; penonton yang macet diputus paksa
+                done, pending = await asyncio.wait(
+                    [client.task for client in clients], timeout=1)
+                for client in clients:
+                    if client.task in pending:
+                        client.writer.transport.abort()
+                if pending:
+                    await asyncio.wait(pending, timeout=1)
+            await self.server.wait_closed()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(5)
+        finally:
+            # Thread siaran tetap dihentikan walau penutupan gagal
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(5)
+            self.loop = None
+
+
+class Scene(object):
+    # State permainan yang disusun ulang dari pesan siaran
+    def __init__(self):
+        self.width = self.height = None
+        self.level = None
+        self.hits = None
+        self.tick = 0
+        self.state = None
+        self.lives = None
+        self.ball = None
+        self.paddle_x = None
+        self.extra = ()
+        self.synced = False
+        # Brick yang berubah sejak take_changes terakhir; full berarti semua
+        # brick (setelah LEVEL atau KEY). Penonton bisa menerima beberapa
+        # pesan di antara dua gambar, jadi perubahan dikumpulkan
+        self.full = True
+        self.changed = set()
+        self.lock = threading.Lock()
+        self.messages = 0
+        self.bytes = 0
+
+    def take_changes(self):
+        with self.lock:
+            full, changed = self.full, self.changed
+            self.full = False
+            self.changed = set()
+        return full, changed
+
+    def apply(self, data):
+        with self.lock:
+            self.apply_locked(data)
+
+    def apply_locked(self, data):
+        self.messages += 1
+        self.bytes += len(data) + LENGTH.size
+        kind = data[0]
+        if kind == LEVEL:
+            _, self.width, self.height, count = LEVEL_HEADER.unpack_from(data)
+            self.level = np.frombuffer(data, dtype=RECORD, count=count,
+                                       offset=LEVEL_HEADER.size)
+            self.hits = bytearray(self.level['hits'].tobytes())
+            self.synced = False
+            self.full = True
+            return
+        if kind == DELTA and not self.synced:
+            return  # Menunggu KEY setelah tersambung atau tertinggal
+        (_, self.tick, state, self.lives, x, y, self.paddle_x,
+         extra) = FRAME.unpack_from(data)
+        self.state = STATES[state]
+        self.ball = (x, y)
+        offset = FRAME.size
+        self.extra = np.frombuffer(data, dtype=POSITION, count=extra,
+                                   offset=offset)
+        offset += extra * POSITION.itemsize
+        count = COUNT.unpack_from(data, offset)[0]
+        offset += COUNT.size
+        if kind == KEY:
+            hits = data[offset:offset + count]
+            if self.synced and not self.full:
+                # KEY berkala: yang digambar ulang cukup selisihnya
+                self.changed.update(np.flatnonzero(
+                    np.frombuffer(hits, dtype=np.uint8) !=
+                    np.frombuffer(self.hits, dtype=np.uint8)).tolist())
+            else:
+                self.full = True
+                self.changed = set()
+            self.hits[:] = hits
+            self.synced = True
+        else:
+            pairs = np.frombuffer(data, dtype=CHANGE, count=count,
+                                  offset=offset)
+            for index, hits in zip(pairs['index'].tolist(),
+                                   pairs['hits'].tolist()):
+                self.hits[index] = hits
+            if not self.full:
+                self.changed.update(pairs['index'].tolist())
+
+    def summary(self):
+        return (self.synced, self.tick, self.state, self.lives,
+                bytes(self.hits), self.ball, self.paddle_x)
+
+
+def world_summary(world):
+    # Yang seharusnya dimiliki penonton; posisi dibulatkan ke float32 seperti
+    # di pesan
+    def f32(value):
+        return float(np.float32(value))
+    return (True, world.tick, world.state, world.lives,
+            bytes(world.hit_counts), (f32(world.ball.x), f32(world.ball.y)),
+            f32(world.paddle.x))
+
+
+async def receive(host, port, scene, on_message=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                header = await reader.readexactly(LENGTH.size)
+                data = await reader.readexactly(LENGTH.unpack(header)[0])
+            except asyncio.IncompleteReadError:
+                return scene
+            scene.apply(data)
+            if on_message is not None:
+                on_message(scene)
+    finally:
+        writer.close()
+
+
+def view_window(host, port):
+    # Penonton dengan jendela Tk: jaringan di thread asyncio, Tk menggambar
+    # scene terbaru setiap 16 ms. Hanya brick yang berubah sejak gambar
+    # sebelumnya yang disentuh; semua brick hanya saat pertama sinkron
+    import tkinter as tk
+    from world import BallState, PaddleState, World
+
+    scene = Scene()
+    thread = threading.Thread(target=lambda: asyncio.run(
+        receive(host, port, scene)))
+    thread.daemon = True
+    thread.start()
+
+    root = tk.Tk()
+    root.title('Break those Bricks! (penonton)')
+    canvas = tk.Canvas(root, bg='#D6D1F5', width=610, height=400)
+    canvas.pack()
+    items = {}
+    colors = {1: '#4535AA', 2: '#ED639E', 3: '#8FE1A2'}
+    radius = BallState(0, 0).radius
+    paddle_state = PaddleState(0, 0)
+    ball = canvas.create_oval(0, 0, 0, 0, fill='white')
+    extra_items = []
+    paddle = canvas.create_rectangle(0, 0, 0, 0, fill='#FFB643')
+    hud = canvas.create_text(50, 20, font=('Forte', 15))
+    size = [None]
+
+    def draw_brick(index, hits):
+        level = scene.level
+        item = items.get(index)
+        if not hits:
+            if item is not None:
+                canvas.delete(items.pop(index))
+            return
+        color = int(level['color'][index])
+        fill = ('#%06x' % (color & 0xFFFFFF) if color & HAS_COLOR
+                else colors[min(hits, 3)])
+        if item is None:
+            x, y = float(level['x'][index]), float(level['y'][index])
+            w = float(level['width'][index]) / 2
+            h = float(level['height'][index]) / 2
+            items[index] = canvas.create_rectangle(x - w, y - h, x + w, y + h,
+                                                   fill=fill)
+            canvas.tag_lower(items[index])
+        else:
+            canvas.itemconfig(item, fill=fill)
+
+    def draw():
+        root.after(16, draw)
+        if scene.level is None or not scene.synced:
+            return
+        if size[0] != (scene.width, scene.height):
+            size[0] = (scene.width, scene.height)
+            canvas.config(width=scene.width, height=scene.height)
+            paddle_state.y = scene.height - World.PADDLE_MARGIN
+        full, changed = scene.take_changes()
+        with scene.lock:
+            hits = bytes(scene.hits)
+            x, y = scene.ball
+            paddle_state.x = scene.paddle_x
+            extra = scene.extra.tolist()
+            lives, state = scene.lives, scene.state
+        for index in (range(len(hits)) if full else changed):
+            draw_brick(index, hits[index])
+        canvas.coords(ball, x - radius, y - radius, x + radius, y + radius)
+        while len(extra_items) < len(extra):
+            extra_items.append(canvas.create_oval(0, 0, 0, 0, fill='white'))
+        while len(extra_items) > len(extra):
+            canvas.delete(extra_items.pop())
+        for item, (x, y) in zip(extra_items, extra):
+            canvas.coords(item, x - radius, y - radius, x + radius, y + radius)
+        canvas.coords(paddle, *paddle_state.get_position())
+        canvas.itemconfig(hud, text='Lives: %s  %s' % (lives, state))
+
+    draw()
+    root.mainloop()
+
+
+def view(argv):
+    parser = argparse.ArgumentParser(description='Penonton BrickGame')
+    parser.add_argument('address', help='HOST:PORT broadcaster')
+    parser.add_argument('--window', action='store_true')
+    args = parser.parse_args(argv)
+    host, port = parse_address(args.address)
+    if args.window:
+        view_window(host, port)
+        return 0
+
+    last = [0.0]
+
+    def report(scene):
+        now = time.perf_counter()
+        if now - last[0] >= 1.0:
+            last[0] = now
+            print('tick %6d  %-9s lives %s  bricks %d  %.0f byte/msg' % (
+                scene.tick, scene.state, scene.lives,
+                sum(1 for hits in scene.hits if hits),
+                scene.bytes / float(scene.messages)))
+
+    asyncio.run(receive(host, port, Scene(), report))
+    return 0
+
+
+def watch(port, pipe):
+    scene = asyncio.run(receive('127.0.0.1', port, Scene()))
+    pipe.send(scene.summary())
+
+
+def test(argv):
+    # Uji lengkap di localhost tanpa jendela: World dimainkan autopilot,
+    # beberapa penonton menerima siaran dan scene mereka dibandingkan
+    from autopilot import Autopilot
+    from world import World
+
+    parser = argparse.ArgumentParser(description='Uji siaran di localhost')
+    parser.add_argument('--ticks', type=int, default=3000)
+    parser.add_argument('--viewers', type=int, default=4)
+    # Jeda antar tick (ms); 0 = secepatnya, 50 = laju permainan asli
+    parser.add_argument('--pace', type=float, default=0)
+    args = parser.parse_args(argv)
+
+    world = World(multiball_every=5)
+    world.add_default_bricks()
+    broadcaster = Broadcaster(world, port=0).start()
+    # Penonton di proses terpisah seperti penonton sungguhan, jadi waktu
+    # publish tidak ikut menanggung kerja mereka
+    pipes = []
+    for _ in range(args.viewers):
+        parent, child = multiprocessing.Pipe()
+        multiprocessing.Process(target=watch, daemon=True,
+                                args=(broadcaster.port, child)).start()
+        pipes.append(parent)
+    while len(broadcaster.clients) < args.viewers:
+        time.sleep(0.01)
+
+    pilot = Autopilot(world)
+    for _ in range(args.ticks):
+        if world.state == BALL_LOST:
+            world.serve()
+        elif world.state not in (READY, PLAYING):
+            break
+        world.step(pilot.actions())
+        broadcaster.publish(world)
+        if args.pace:
+            time.sleep(args.pace / 1000.0)
+
+    stats = broadcaster.stats()
+    # Koneksi ditutup setelah buffer terkirim; penonton lalu melapor
+    broadcaster.close()
+    expected = world_summary(world)
+    ok = all(pipe.poll(10) and pipe.recv() == expected for pipe in pipes)
+    print('ticks          %d (%s)' % (world.tick, world.state))
+    print('viewers        %d, %s' % (args.viewers,
+                                     'scene cocok' if ok else 'SCENE BERBEDA'))
+    print('delta          %.1f byte/tick' % stats['delta_bytes_mean'])
+    print('key            %.1f byte, %d kali' % (stats['key_bytes_mean'],
+                                                  stats['keys']))
+    print('publish        mean %.1f us, p50 %.1f us, p99 %.1f us' % (
+        stats['publish_us_mean'], stats['publish_us_p50'],
+        stats['publish_us_p99']))
+    print('dropped        %d' % stats['dropped'])
+    return 0 if ok else 1
+
+
+def main(argv):
+    if argv and argv[0] == 'view':
+        return view(argv[1:])
+    if argv and argv[0] == 'test':
+        return test(argv[1:])
+    print('pakai: spectate.py view HOST:PORT [--window] | spectate.py test')
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
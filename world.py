@@ -0,0 +1,527 @@
+# Model dunia permainan tanpa Tk: posisi, arah dan sisa hit disimpan di sini
+# sehingga fisika bisa dijalankan tanpa layar (misalnya di mesin CI).
+
+import math
+import struct
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+from events import BallLost, BrickDestroyed, BrickHit, LevelCleared
+from multiball import BallArray
+
+LEFT = 'left'
+RIGHT = 'right'
+LAUNCH = 'launch'
+
+READY = 'ready'
+PLAYING = 'playing'
+BALL_LOST = 'ball_lost'
+WON = 'won'
+LOST = 'lost'
+
+
+# State lengkap World pada satu tick (lihat World.snapshot). ball berisi
+# (x, y, dx, dy, speed, radius), extra berisi (slot, x, y, dx, dy) untuk setiap
+# bola tambahan yang hidup, hits adalah sisa hit semua brick sebagai bytes.
+WorldSnapshot = namedtuple('WorldSnapshot', [
+    'tick', 'state', 'lives', 'destroyed', 'paddle_bounces', 'live_bricks',
+    'paddle_x', 'ball', 'extra', 'hits'])
+
+
+class Body(object):
+    # __slots__: level besar bisa berisi ratusan ribu brick, tanpa __dict__
+    # setiap objek jauh lebih kecil
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def get_position(self):
+        return [self.x - self.width / 2, self.y - self.height / 2,
+                self.x + self.width / 2, self.y + self.height / 2]
+
+    def move(self, x, y):
+        self.x += x
+        self.y += y
+
+    def overlaps(self, coords):
+        own = self.get_position()
+        return (own[0] <= coords[2] and own[2] >= coords[0] and
+                own[1] <= coords[3] and own[3] >= coords[1])
+
+
+class BallState(Body):
+    __slots__ = ('radius', 'direction', 'speed')
+
+    def __init__(self, x, y, radius=10, speed=5):
+        super(BallState, self).__init__(x, y, radius * 2, radius * 2)
+        self.radius = radius
+        self.direction = [1, -1]
+        # increase the below value to increase the speed of ball; above
+        # ~20 px per tick use World(swept=True) or the ball tunnels
+        self.speed = speed
+
+
+class PaddleState(Body):
+    __slots__ = ()
+
+    def __init__(self, x, y, width=80, height=10):
+        super(PaddleState, self).__init__(x, y, width, height)
+
+
+class BrickState(Body):
+    __slots__ = ('index', 'hits', 'color')
+
+    def __init__(self, index, x, y, hits, width=75, height=20, color=None):
+        super(BrickState, self).__init__(x, y, width, height)
+        self.index = index
+        self.hits = hits
+        # None: warna mengikuti sisa hit; selain itu warna tetap dari level
+        self.color = color
+
+    @property
+    def alive(self):
+        return self.hits > 0
+
+
+def sweep_box(x, y, vx, vy, radius, box):
+    # Tabrakan lingkaran bergerak vs kotak: cari waktu tabrakan t dalam [0, 1]
+    # pada lintasan (x, y) + (vx, vy) * t. Mengembalikan (t, nx, ny) dengan
+    # normal permukaan, atau None bila tidak kena atau bola sedang menjauh.
+    t_near = -math.inf
+    t_far = math.inf
+    normal = (0, 0)
+    for p, v, low, high, axis in ((x, vx, box[0] - radius, box[2] + radius, 0),
+                                  (y, vy, box[1] - radius, box[3] + radius, 1)):
+        if v == 0:
+            if p < low or p > high:
+                return None
+            continue
+        t1 = (low - p) / v
+        t2 = (high - p) / v
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_near:
+            t_near = t1
+            sign = -1 if v > 0 else 1
+            normal = (sign, 0) if axis == 0 else (0, sign)
+        t_far = min(t_far, t2)
+    if t_near > t_far or t_far <= 1e-9 or t_near > 1 or normal == (0, 0):
+        return None
+
+    hx = x + vx * t_near
+    hy = y + vy * t_near
+    if (hx < box[0] or hx > box[2]) and (hy < box[1] or hy > box[3]):
+        # Masuk di daerah sudut: kotak yang diperbesar punya sudut bulat,
+        # jadi yang dihitung adalah tabrakan dengan lingkaran di titik sudut
+        cx = box[0] if hx < box[0] else box[2]
+        cy = box[1] if hy < box[1] else box[3]
+        dx = x - cx
+        dy = y - cy
+        a = vx * vx + vy * vy
+        b = 2 * (dx * vx + dy * vy)
+        c = dx * dx + dy * dy - radius * radius
+        disc = b * b - 4 * a * c
+        if disc < 0:
+            return None
+        t_near = max((-b - math.sqrt(disc)) / (2 * a), 0.0)
+        if t_near > 1:
+            return None
+        nx = x + vx * t_near - cx
+        ny = y + vy * t_near - cy
+        length = math.hypot(nx, ny) or 1.0
+        normal = (nx / length, ny / length)
+
+    if normal[0] * vx + normal[1] * vy >= 0:
+        return None
+    return max(t_near, 0.0), normal[0], normal[1]
+
+
+class BrickGrid(object):
+    # Indeks spasial sederhana: setiap brick didaftarkan ke semua sel grid
+    # yang ditutupinya, sehingga pencarian tabrakan hanya memeriksa brick di
+    # sekitar bola, bukan seluruh level.
+    def __init__(self, cell_width=80, cell_height=40):
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.cells = {}
+
+    def cell_range(self, coords):
+        return (range(int(coords[0] // self.cell_width),
+                      int(coords[2] // self.cell_width) + 1),
+                range(int(coords[1] // self.cell_height),
+                      int(coords[3] // self.cell_height) + 1))
+
+    def insert(self, brick, coords=None):
+        columns, rows = self.cell_range(coords or brick.get_position())
+        cells = self.cells
+        for column in columns:
+            for row in rows:
+                cell = cells.get((column, row))
+                if cell is None:
+                    cells[(column, row)] = [brick]
+                else:
+                    cell.append(brick)
+
+    def remove(self, brick):
+        columns, rows = self.cell_range(brick.get_position())
+        for column in columns:
+            for row in rows:
+                cell = self.cells.get((column, row))
+                if cell is not None and brick in cell:
+                    cell.remove(brick)
+                    if not cell:
+                        del self.cells[(column, row)]
+
+    def query(self, coords):
+        found = {}
+        columns, rows = self.cell_range(coords)
+        for column in columns:
+            for row in rows:
+                for brick in self.cells.get((column, row), ()):
+                    if brick.overlaps(coords):
+                        found[brick.index] = brick
+        return [found[index] for index in sorted(found)]
+
+
+class World(object):
+    # Paddle dan bola diletakkan relatif terhadap dasar lapangan; untuk
+    # tinggi 400 hasilnya tetap y 326 dan 310 seperti semula
+    PADDLE_MARGIN = 74
+    BALL_GAP = 16
+    PADDLE_STEP = 10
+
+    MAX_BOUNCES = 8
+
+    def __init__(self, width=610, height=400, lives=3, swept=False,
+                 multiball_every=0, launch_balls=0, ball_speed=5):
+        self.width = width
+        self.height = height
+        self.lives = lives
+        self.swept = swept
+        # Power-up: setiap N brick hancur melepaskan 2 bola tambahan (0 = mati)
+        self.multiball_every = multiball_every
+        # Mode stres: jumlah bola tambahan yang ikut diluncurkan setiap start
+        self.launch_balls = launch_balls
+        self.ball_speed = ball_speed
+        self.destroyed = 0
+        self.paddle_bounces = 0
+        self.tick = 0
+        self.bricks = []
+        # Salinan sisa hit semua brick (satu byte per brick) supaya snapshot
+        # dan checksum tidak perlu melewati setiap objek brick
+        self.hit_counts = bytearray()
+        self.grid = BrickGrid()
+        self.live_bricks = 0
+        self.brick_region = [math.inf, math.inf, -math.inf, -math.inf]
+        self.extra_balls = BallArray(speed=ball_speed)
+        self.paddle_y = height - self.PADDLE_MARGIN
+        self.paddle = PaddleState(width / 2, self.paddle_y)
+        self.ball = None
+        self.state = READY
+        # EventBus (atau apa pun yang punya emit) untuk efek samping; tanpa
+        # bus World tidak mencatat event sama sekali
+        self.bus = None
+        self.serve()
+
+    def add_brick(self, x, y, hits, width=75, height=20, color=None):
+        brick = BrickState(len(self.bricks), x, y, hits, width, height, color)
+        self.bricks.append(brick)
+        self.hit_counts.append(hits)
+        coords = brick.get_position()
+        if brick.alive:
+            # Brick 0 hit hanya tercatat (indeks tetap sama dengan level),
+            # tidak bisa ditabrak dan tidak perlu dihancurkan untuk menang
+            self.grid.insert(brick, coords)
+            self.live_bricks += 1
+        region = self.brick_region
+        region[0] = min(region[0], coords[0])
+        region[1] = min(region[1], coords[1])
+        region[2] = max(region[2], coords[2])
+        region[3] = max(region[3], coords[3])
+        return brick
+
+    def hit_brick(self, brick, hits):
+        brick.hits -= 1
+        self.hit_counts[brick.index] = brick.hits
+        hits.append(brick)
+        if self.bus is not None:
+            event = BrickHit if brick.alive else BrickDestroyed
+            self.bus.emit(event(self.tick, brick))
+        if not brick.alive:
+            self.grid.remove(brick)
+            self.live_bricks -= 1
+            self.destroyed += 1
+            if self.multiball_every and self.destroyed % self.multiball_every == 0:
+                self.split_ball(2)
+
+    def add_default_bricks(self):
+        # adding brick with different hit capacities - 3,2 and 1
+        for x in range(5, self.width - 5, 75):
+            self.add_brick(x + 37.5, 50, 3)
+            self.add_brick(x + 37.5, 70, 2)
+            self.add_brick(x + 37.5, 90, 1)
+
+    def bricks_left(self):
+        return self.live_bricks
+
+    def serve(self):
+        # Bola baru diletakkan di atas paddle dan ikut bergerak bersamanya
+        self.ball = BallState(self.paddle.x, self.paddle_y - self.BALL_GAP,
+                              speed=self.ball_speed)
+        self.extra_balls.alive[:] = False
+        self.state = READY
+
+    def split_ball(self, count):
+        # Bola tambahan muncul dari posisi bola utama
+        return self.extra_balls.spread(self.ball.x, self.ball.y, count)
+
+    def ball_count(self):
+        return 1 + self.extra_balls.live_count()
+
+    def promote_ball(self):
+        # Bola utama jatuh tapi masih ada bola tambahan: salah satunya
+        # menjadi bola utama, jadi nyawa belum berkurang
+        extra = self.extra_balls
+        slot = extra.live_slots()[0]
+        ball = BallState(extra.x[slot], extra.y[slot], extra.radius,
+                         extra.speed)
+        ball.direction = [extra.dx[slot], extra.dy[slot]]
+        extra.alive[slot] = False
+        self.ball = ball
+
+    def launch(self):
+        if self.state == READY:
+            self.state = PLAYING
+            if self.launch_balls:
+                self.split_ball(self.launch_balls)
+
+    def move_paddle(self, offset):
+        coords = self.paddle.get_position()
+        if coords[0] + offset >= 0 and coords[2] + offset <= self.width:
+            self.paddle.move(offset, 0)
+            if self.state == READY:
+                self.ball.move(offset, 0)
+            return True
+        return False
+
+    def apply(self, action):
+        if action == LEFT:
+            self.move_paddle(-self.PADDLE_STEP)
+        elif action == RIGHT:
+            self.move_paddle(self.PADDLE_STEP)
+        elif action == LAUNCH:
+            self.launch()
+
+    def step(self, inputs=()):
+        for action in inputs:
+            self.apply(action)
+
+        if self.state != PLAYING:
+            return []
+
+        self.tick += 1
+        if self.swept:
+            # Bola dipindah dan ditabrakkan sekaligus dalam satu tick
+            hits = self.sweep_ball()
+        else:
+            hits = self.check_collisions()
+        if self.extra_balls.alive.any():
+            extra_hits, _ = self.extra_balls.step(self)
+            for brick in extra_hits:
+                if brick.alive:
+                    self.hit_brick(brick, hits)
+        if self.bricks_left() == 0:
+            self.state = WON
+            if self.bus is not None:
+                self.bus.emit(LevelCleared(self.tick))
+        elif self.ball.get_position()[3] >= self.height:
+            if self.extra_balls.alive.any():
+                self.promote_ball()
+            else:
+                self.lives -= 1
+                self.state = LOST if self.lives < 0 else BALL_LOST
+                if self.bus is not None:
+                    self.bus.emit(BallLost(self.tick, self.lives))
+        elif not self.swept:
+            self.update_ball()
+        return hits
+
+    def checksum(self):
+        # Sidik jari seluruh state dunia, dipakai untuk memastikan replay
+        # tidak menyimpang dari rekaman
+        ball = self.ball
+        extra = self.extra_balls
+        alive = extra.alive
+        crc = zlib.crc32(struct.pack(
+            '<Iddddddiii', self.tick, ball.x, ball.y, ball.direction[0],
+            ball.direction[1], ball.speed, self.paddle.x, self.lives,
+            self.live_bricks, len(self.bricks)))
+        crc = zlib.crc32(self.hit_counts, crc)
+        for array in (extra.x, extra.y, extra.dx, extra.dy):
+            crc = zlib.crc32(array[alive].tobytes(), crc)
+        return crc
+
+    def snapshot(self):
+        ball = self.ball
+        extra = self.extra_balls
+        return WorldSnapshot(
+            self.tick, self.state, self.lives, self.destroyed,
+            self.paddle_bounces, self.live_bricks, self.paddle.x,
+            (ball.x, ball.y, ball.direction[0], ball.direction[1], ball.speed,
+             ball.radius),
+            tuple((int(slot), extra.x[slot], extra.y[slot], extra.dx[slot],
+                   extra.dy[slot]) for slot in extra.live_slots()),
+            bytes(self.hit_counts))
+
+    def restore(self, snapshot):
+        # Mengembalikan World ke snapshot dari level yang sama; hanya brick
+        # yang sisa hitnya berbeda yang disentuh. Mengembalikan brick itu
+        # supaya tampilan bisa menyesuaikan.
+        if len(snapshot.hits) != len(self.bricks):
+            raise ValueError('snapshot berasal dari level lain')
+        self.tick = snapshot.tick
+        self.state = snapshot.state
+        self.lives = snapshot.lives
+        self.destroyed = snapshot.destroyed
+        self.paddle_bounces = snapshot.paddle_bounces
+        self.live_bricks = snapshot.live_bricks
+        self.paddle.x = snapshot.paddle_x
+        x, y, dx, dy, speed, radius = snapshot.ball
+        self.ball = BallState(x, y, radius, speed)
+        self.ball.direction = [dx, dy]
+        extra = self.extra_balls
+        extra.alive[:] = False
+        for slot, x, y, dx, dy in snapshot.extra:
+            extra.x[slot], extra.y[slot] = x, y
+            extra.dx[slot], extra.dy[slot] = dx, dy
+            extra.alive[slot] = True
+
+        current = np.frombuffer(self.hit_counts, dtype=np.uint8)
+        target = np.frombuffer(snapshot.hits, dtype=np.uint8)
+        changed = []
+        for index in np.flatnonzero(current != target).tolist():
+            brick = self.bricks[index]
+            was_alive = brick.alive
+            brick.hits = snapshot.hits[index]
+            if was_alive and not brick.alive:
+                self.grid.remove(brick)
+            elif brick.alive and not was_alive:
+                self.grid.insert(brick)
+            changed.append(brick)
+        del current
+        self.hit_counts[:] = snapshot.hits
+        return changed
+
+    def update_ball(self):
+        ball = self.ball
+        coords = ball.get_position()
+        if coords[0] <= 0 or coords[2] >= self.width:
+            ball.direction[0] *= -1
+        if coords[1] <= 0:
+            ball.direction[1] *= -1
+        ball.move(ball.direction[0] * ball.speed,
+                  ball.direction[1] * ball.speed)
+
+    def sweep_ball(self):
+        ball = self.ball
+        radius = ball.radius
+        remaining = 1.0
+        hits = []
+        # Objek yang baru saja memantulkan bola diabaikan hanya untuk kontak
+        # di t = 0, supaya bola yang menempel tidak memantul bolak-balik di
+        # tempat; kontak berikutnya dalam tick yang sama tetap dihitung
+        touched = ()
+        for _ in range(self.MAX_BOUNCES):
+            vx = ball.direction[0] * ball.speed * remaining
+            vy = ball.direction[1] * ball.speed * remaining
+            # Tabrakan paling awal di antara dinding, paddle dan brick
+            first = 1.0
+            contacts = []
+            for t, nx, ny, target in self.sweep_contacts(ball.x, ball.y,
+                                                         vx, vy, radius):
+                if t <= 1e-9 and target in touched:
+                    continue
+                if t < first - 1e-9:
+                    first = t
+                    contacts = [(nx, ny, target)]
+                elif t <= first + 1e-9:
+                    contacts.append((nx, ny, target))
+            ball.move(vx * first, vy * first)
+            if not contacts:
+                break
+
+            flip_x = flip_y = False
+            touched = [target for _, _, target in contacts]
+            for nx, ny, target in contacts:
+                if abs(nx) > 0 and abs(ny) > 0:
+                    # Pantulan di sudut: cerminkan arah terhadap normal
+                    dot = ball.direction[0] * nx + ball.direction[1] * ny
+                    ball.direction[0] -= 2 * dot * nx
+                    ball.direction[1] -= 2 * dot * ny
+                elif nx:
+                    flip_x = True
+                else:
+                    flip_y = True
+                if isinstance(target, BrickState) and target.alive:
+                    self.hit_brick(target, hits)
+                elif target is self.paddle:
+                    self.paddle_bounces += 1
+            if flip_x:
+                ball.direction[0] *= -1
+            if flip_y:
+                ball.direction[1] *= -1
+            remaining *= 1.0 - first
+            if remaining <= 1e-9:
+                break
+        return hits
+
+    def sweep_contacts(self, x, y, vx, vy, radius):
+        if vx < 0 and x + vx <= radius:
+            yield max((radius - x) / vx, 0.0), 1, 0, 'left'
+        elif vx > 0 and x + vx >= self.width - radius:
+            yield max((self.width - radius - x) / vx, 0.0), -1, 0, 'right'
+        if vy < 0 and y + vy <= radius:
+            yield max((radius - y) / vy, 0.0), 0, 1, 'top'
+        path = [min(x, x + vx) - radius, min(y, y + vy) - radius,
+                max(x, x + vx) + radius, max(y, y + vy) + radius]
+        targets = self.grid.query(path)
+        if self.paddle.overlaps(path):
+            targets.append(self.paddle)
+        for target in targets:
+            contact = sweep_box(x, y, vx, vy, radius, target.get_position())
+            if contact is not None:
+                yield contact + (target,)
+
+    def find_overlapping(self, coords):
+        objects = self.grid.query(coords)
+        if self.paddle.overlaps(coords):
+            objects.append(self.paddle)
+        return objects
+
+    def check_collisions(self):
+        ball = self.ball
+        objects = self.find_overlapping(ball.get_position())
+        if len(objects) > 1:
+            ball.direction[1] *= -1
+        elif len(objects) == 1:
+            coords = objects[0].get_position()
+            if ball.x > coords[2]:
+                ball.direction[0] = 1
+            elif ball.x < coords[0]:
+                ball.direction[0] = -1
+            else:
+                ball.direction[1] *= -1
+
+        hits = []
+        for game_object in objects:
+            if isinstance(game_object, BrickState):
+                self.hit_brick(game_object, hits)
+            else:
+                self.paddle_bounces += 1
+        return hits